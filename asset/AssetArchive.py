@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import io
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import typing
+
+
+class AssetArchive:
+    """
+    Read-only view of a packed asset archive.
+
+    Layout: `MAGIC`, the byte length of the index as a little-endian uint32, a UTF-8 JSON index mapping asset paths
+    to `[offset, size, mtime_ns, sha1]`, then the concatenated asset files. Offsets are relative to the end of the
+    index. The whole file is memory-mapped, so reading an asset does not cost any syscall.
+    The size, modification time and content hash of the packed files are kept so that `is_stale` can tell when a loose
+    file was edited after packing. Only the hash is trusted when the modification time differs, since copies and
+    checkouts do not keep it.
+    """
+    MAGIC = b"PRPAK001"
+    INDEX_LENGTH_FORMAT = "<I"
+    DEFAULT_FILE_PATH = "asset/assets.pak"
+
+    def __init__(self, file_path: str):
+        self.__file_path = file_path
+        with open(file_path, "rb") as f:
+            self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.__mmap[:len(AssetArchive.MAGIC)] != AssetArchive.MAGIC:
+            self.__mmap.close()
+            raise ValueError(f"{file_path} is not an asset archive")
+
+        (index_length,) = struct.unpack_from(AssetArchive.INDEX_LENGTH_FORMAT, self.__mmap, len(AssetArchive.MAGIC))
+        index_offset = AssetArchive.header_size()
+        self.__data_offset = index_offset + index_length
+        self.__index: typing.Dict[str, typing.List[typing.Union[int, str]]] = \
+            json.loads(self.__mmap[index_offset:self.__data_offset].decode("utf-8"))
+
+    @property
+    def file_path(self) -> str:
+        return self.__file_path
+
+    @property
+    def paths(self) -> typing.KeysView[str]:
+        return self.__index.keys()
+
+    def is_stale(self, path: str) -> bool:
+        # A loose file that differs from the packed one takes precedence; without a loose file the archive is used
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        entry = self.__index[path]
+        if stat.st_size != entry[1]:
+            return True
+        if len(entry) < 3 or stat.st_mtime_ns == entry[2]:
+            return False
+        if len(entry) < 4:
+            return True
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest() != entry[3]
+
+    def read(self, path: str) -> bytes:
+        (offset, size) = self.__index[path][:2]
+        offset += self.__data_offset
+        return self.__mmap[offset:offset + size]
+
+    def open(self, path: str, mode: str = "rb") -> typing.IO:
+        stream = io.BytesIO(self.read(path))
+        if 'b' in mode:
+            return stream
+        return io.TextIOWrapper(stream, encoding="utf-8")
+
+    def close(self):
+        self.__mmap.close()
+
+    def __contains__(self, path: str):
+        return path in self.__index
+
+    def __len__(self):
+        return len(self.__index)
+
+    def __repr__(self):
+        return f"AssetArchive({self.__file_path!r}, entries={len(self.__index)})"
+
+    @staticmethod
+    def header_size() -> int:
+        return len(AssetArchive.MAGIC) + struct.calcsize(AssetArchive.INDEX_LENGTH_FORMAT)
+
+    @staticmethod
+    def build(file_path: str, paths: typing.Iterable[str]):
+        index = {}
+        blobs = []
+        offset = 0
+        for path in sorted(paths):
+            with open(path, "rb") as f:
+                blob = f.read()
+                mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            index[path] = [offset, len(blob), mtime_ns, hashlib.sha1(blob).hexdigest()]
+            blobs.append(blob)
+            offset += len(blob)
+
+        encoded_index = json.dumps(index).encode("utf-8")
+        with open(file_path, "wb") as f:
+            f.write(AssetArchive.MAGIC)
+            f.write(struct.pack(AssetArchive.INDEX_LENGTH_FORMAT, len(encoded_index)))
+            f.write(encoded_index)
+            [f.write(blob) for blob in blobs]
+
+
+if __name__ == '__main__':
+    # Packs every addressable asset: python -m asset.AssetArchive [output path]
+    from asset.AssetObjectFactory import AssetObjectFactory
+
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s][%(levelname)s][%(name)s] %(message)s")
+    output_path = sys.argv[1] if len(sys.argv) > 1 else AssetArchive.DEFAULT_FILE_PATH
+    asset_paths = [path for path in AssetObjectFactory.ASSET_PROPS if path is not None]
+    AssetArchive.build(output_path, asset_paths)
+    logging.getLogger(AssetArchive.__name__).info(f"Packed {len(asset_paths)} assets into {output_path}")
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+import pygame.event
+
+from asset.AssetObjectFactory import AssetObjectFactory
+from core.thread_model.SubsystemThread import SubsystemThread
+from event.CustomEventTypes import CustomEventTypes
+from event.EventDispatcher import EventDispatcher
+from event.EventHandler import EventHandler
+
+
+class AssetLoaderThread(SubsystemThread):
+    # How long the thread sleeps on an empty queue before checking whether it was stopped
+    WAIT_TIMEOUT = 0.1
+
+    def __init__(self, global_event_dispatcher: EventDispatcher):
+        super().__init__(global_event_dispatcher)
+        self.__asset_object_factory = AssetObjectFactory()
+
+        self.logger.debug(f"Setting up event handlers")
+        self.__event_handler_asset_preload_request = \
+            EventHandler("asset-preload-request", lambda e: self.on_asset_preload_request(e))
+
+        # Registered here rather than in before_looper so that requests posted before the thread runs are queued
+        self.logger.debug(f"Registering event handlers")
+        self.local_event_dispatcher.register(
+            CustomEventTypes.EVENT_ASSET_PRELOAD_REQUEST, "default", self.__event_handler_asset_preload_request)
+
+    @property
+    def asset_object_factory(self):
+        return self.__asset_object_factory
+
+    def loop(self):
+        # Requests are rare, so the thread blocks on its queue rather than polling it
+        self.local_event_dispatcher.dispatch(AssetLoaderThread.WAIT_TIMEOUT)
+
+    def on_asset_preload_request(self, event: pygame.event.Event):
+        self.logger.debug(f"Preloading {len(event.manifest)} assets")
+        [self.__asset_object_factory.preload(asset_key) for asset_key in event.manifest if self.running]
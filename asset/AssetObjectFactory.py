@@ -1,14 +1,19 @@
 # -*- coding: utf-8 -*-
+import copy
 import logging
 import os
+import sys
+import threading
 import typing
 
 import pygame.image
 
+from asset.AssetArchive import AssetArchive
 from core.object_model.Map import Map
 from core.object_model.Sound import Sound
 from core.object_model.Sprite import Sprite
 from core.object_model.Text import Text
+from util.LRUCache import LRUCache
 
 
 class AssetObjectFactory:
@@ -54,13 +59,42 @@ class AssetObjectFactory:
         None: {"key": "asset.map.random"}
     }
 
+    CACHE_BUDGET = 256 * 1024 * 1024
+    # Assets are served from the archive built by `python -m asset.AssetArchive` when it exists.
+    # Loose files are used otherwise, when they were edited after packing, or when disabled for development.
+    ARCHIVE_PATH = AssetArchive.DEFAULT_FILE_PATH
+    USE_ARCHIVE = True
+    # Edited loose files are only looked for when running from source; frozen builds ship the archive alone
+    CHECK_STALE = not getattr(sys, "frozen", False)
+
     __asset_id_path_dict = {value["key"]: key for key, value in ASSET_PROPS.items()}
     __instance = None
 
+    @classmethod
+    def set_cache_budget(cls, cache_budget: int):
+        cls.CACHE_BUDGET = cache_budget
+        if cls.__instance is not None:
+            cls.__instance.__cache.budget = cache_budget
+
     def __new__(cls, *args, **kwargs):
         def init(instance):
             instance.__logger = logging.getLogger(instance.__class__.__name__)
 
+            # Decoded assets, so that repeated spawns touch neither the filesystem nor the decoders.
+            # Sprites are cached as converted surfaces, while maps and texts are cached as templates that every caller
+            # gets a copy of, so that a scene rebuild never sees what the previous one did to its objects.
+            instance.__cache = LRUCache(AssetObjectFactory.CACHE_BUDGET, AssetObjectFactory.asset_byte_size,
+                                        lambda key, _: instance.__logger.debug(f"Evicted asset {key} from cache"))
+            # Assets may be decoded by the loader thread while the main thread builds a scene
+            instance.__cache_lock = threading.RLock()
+            instance.__pending_loads: typing.Dict[str, threading.Event] = {}
+
+            instance.__archive: typing.Optional[AssetArchive] = None
+            if AssetObjectFactory.USE_ARCHIVE and os.path.isfile(AssetObjectFactory.ARCHIVE_PATH):
+                instance.__logger.info(f"Loading asset archive {AssetObjectFactory.ARCHIVE_PATH}")
+                instance.__archive = AssetArchive(AssetObjectFactory.ARCHIVE_PATH)
+                return
+
             instance.__logger.info("Scanning asset directories")
             asset_file_paths = []
             for target_dir in AssetObjectFactory.ASSET_DIRS:
@@ -82,6 +116,110 @@ class AssetObjectFactory:
 
         return cls.__instance
 
+    @property
+    def archive(self) -> typing.Optional[AssetArchive]:
+        return self.__archive
+
+    @property
+    def cache(self) -> LRUCache:
+        return self.__cache
+
+    @property
+    def cache_hits(self) -> int:
+        return self.__cache.hits
+
+    @property
+    def cache_misses(self) -> int:
+        return self.__cache.misses
+
+    @property
+    def cache_evictions(self) -> int:
+        return self.__cache.evictions
+
+    @staticmethod
+    def asset_byte_size(asset: typing.Any) -> int:
+        if isinstance(asset, Sprite):
+            asset = asset.surface
+        if isinstance(asset, pygame.surface.Surface):
+            return asset.get_pitch() * asset.get_height()
+        if isinstance(asset, Map):
+            # Roughly one pointer per tile plus the row lists
+            return 8 * (asset.tile_count[0] + 1) * (asset.tile_count[1] + 1)
+        return 0
+
+    @staticmethod
+    def copy_asset(asset: typing.Any) -> typing.Any:
+        if isinstance(asset, Map):
+            return copy.deepcopy(asset)
+        asset = copy.copy(asset)
+        if isinstance(asset, Sprite):
+            # The rendered surface is shared like cached sprite surfaces, only the placement is per object
+            asset.rect = asset.rect.copy()
+        return asset
+
+    def open_asset(self, path: str, mode: str = "rb") -> typing.IO:
+        if self.__archive is not None and path in self.__archive:
+            if not AssetObjectFactory.CHECK_STALE or not self.__archive.is_stale(path):
+                return self.__archive.open(path, mode)
+            self.__logger.warning(f"{path} changed since {self.__archive.file_path} was packed, loading it from disk")
+        return open(path, mode)
+
+    def load_surface(self, path: str) -> pygame.surface.Surface:
+        with self.open_asset(path) as f:
+            # The path doubles as the name hint, from which pygame picks the decoder
+            return pygame.image.load(f, path).convert_alpha()
+
+    def load_sound(self, path: str, *args, **kwargs) -> Sound:
+        with self.open_asset(path) as f:
+            return Sound(f, *args, **kwargs)
+
+    def load_text(self, path: str, *args, **kwargs) -> Text:
+        with self.open_asset(path, "r") as f:
+            return Text(f, *args, **kwargs)
+
+    def load_map(self, path: str, *args, **kwargs) -> Map:
+        with self.open_asset(path, "r") as f:
+            return Map(f, *args, **kwargs)
+
+    def load_cached(self, asset_key: str, loader: typing.Callable[[str], typing.Any]) -> typing.Any:
+        while True:
+            with self.__cache_lock:
+                asset = self.__cache.get(asset_key)
+                if asset is not None:
+                    return asset
+
+                pending_load = self.__pending_loads.get(asset_key)
+                if pending_load is None:
+                    pending_load = threading.Event()
+                    self.__pending_loads[asset_key] = pending_load
+                    break
+
+            # Another thread is decoding the same asset; wait for it instead of decoding twice
+            pending_load.wait()
+
+        self.__logger.debug(f"Asset cache miss for {asset_key}")
+        try:
+            asset = loader(AssetObjectFactory.__asset_id_path_dict[asset_key])
+            with self.__cache_lock:
+                self.__cache.put(asset_key, asset)
+        finally:
+            with self.__cache_lock:
+                self.__pending_loads.pop(asset_key)
+            pending_load.set()
+
+        return asset
+
+    def preload(self, asset_key: str):
+        asset_type = asset_key.split('.')[1]
+        if asset_type == "sprite":
+            self.load_cached(asset_key, self.load_surface)
+        elif asset_type == "text":
+            self.load_cached(asset_key, self.load_text)
+        elif asset_type == "map" and AssetObjectFactory.__asset_id_path_dict[asset_key] is not None:
+            self.load_cached(asset_key, self.load_map)
+        else:
+            self.__logger.debug(f"Asset {asset_key} cannot be preloaded")
+
     def new_asset_object(self, asset_key: str, *args, **kwargs) -> typing.Any:
         self.__logger.debug(f"Creating asset object with asset key {asset_key}")
         fields = asset_key.split('.')
@@ -94,16 +232,25 @@ class AssetObjectFactory:
 
         if asset_type == "sprite":
             self.__logger.debug("Creating a sprite object")
-            return Sprite(pygame.image.load(AssetObjectFactory.__asset_id_path_dict[asset_key]), *args, **kwargs)
+            surface = self.load_cached(asset_key, self.load_surface)
+            return Sprite(surface, *args, convert=False, **kwargs)
         if asset_type == "sound":
             self.__logger.debug("Creating a sound object")
-            return Sound(AssetObjectFactory.__asset_id_path_dict[asset_key], *args, **kwargs)
+            return self.load_sound(AssetObjectFactory.__asset_id_path_dict[asset_key], *args, **kwargs)
         if asset_type == "text":
             self.__logger.debug("Creating a text object")
-            return Text(AssetObjectFactory.__asset_id_path_dict[asset_key], *args, **kwargs)
+            if len(args) or len(kwargs):
+                # Only the plain asset is cached, since the cache is keyed by the asset key alone
+                return self.load_text(AssetObjectFactory.__asset_id_path_dict[asset_key], *args, **kwargs)
+            return self.copy_asset(self.load_cached(asset_key, self.load_text))
         if asset_type == "map":
             self.__logger.debug("Creating a map object")
-            return Map(AssetObjectFactory.__asset_id_path_dict[asset_key], *args, **kwargs)
+            if AssetObjectFactory.__asset_id_path_dict[asset_key] is None:
+                # Randomly generated maps are unique by definition
+                return Map(None, *args, **kwargs)
+            if len(args) or len(kwargs):
+                return self.load_map(AssetObjectFactory.__asset_id_path_dict[asset_key], *args, **kwargs)
+            return self.copy_asset(self.load_cached(asset_key, self.load_map))
 
         self.__logger.debug(f"Unknown asset type {asset_type}. Object not created")
         return
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import multiprocessing
+import os
+import statistics
+import typing
+from multiprocessing.connection import Connection
+
+from bench.SceneBenchmark import ResultType, SceneBenchmark
+from bench.scene.BacteriaSwarm import BacteriaSwarm
+from bench.scene.BulletStorm import BulletStorm
+from bench.scene.RandomMapSprawl import RandomMapSprawl
+from game.scene.Level0 import Level0
+from game.scene.Level0Plus import Level0Plus
+from game.scene.Level1 import Level1
+from game.scene.Level2 import Level2
+from game.scene.Menu import Menu
+
+
+class BenchmarkSuite:
+    """
+    Runs the scene benchmarks and checks them against stored baselines.
+
+    Every run of a scenario happens in a process of its own, so that peak memory and caches are not carried over.
+    Scenarios are run `repeat` times and each metric is the median of the runs, which keeps single noisy runs out of
+    the comparison. A metric regresses when it exceeds its baseline by more than its relative tolerance, taken from
+    `metricTolerances` or `tolerance` otherwise, plus `absoluteTolerance` in the metric's unit.
+    A scenario whose process crashes is reported as a regression of its own.
+    The suite is local-only: no CI job runs it, and baselines only hold for the machine they were recorded on.
+    Record them with `--update-baselines` on the machine that runs the comparison, e.g. before a change.
+    """
+    SCENARIOS = {
+        "Menu": Menu,
+        "Level0": Level0,
+        "Level0Plus": Level0Plus,
+        "Level1": Level1,
+        "Level2": Level2,
+        "Level2-1k-bullets": BulletStorm,
+        "Level2-200-bacteria": BacteriaSwarm,
+        "random-map-200x200": RandomMapSprawl,
+    }
+    BASELINE_FILE_PATH = os.path.join("bench", "baselines.json")
+    DEFAULT_TOLERANCE = 0.1
+    DEFAULT_ABSOLUTE_TOLERANCE = 0.05
+    # Build times and tail latencies spread more between runs than medians do
+    DEFAULT_METRIC_TOLERANCES = {"build": 0.2, "update_p99": 0.2, "render_p99": 0.2}
+    DEFAULT_REPEAT = 3
+
+    @staticmethod
+    def run_scenario(name: str, frames: int, size: typing.Tuple[int, int], connection: Connection):
+        logging.basicConfig(level=logging.INFO, format="[%(asctime)s][%(levelname)s][%(name)s] %(message)s")
+        connection.send(SceneBenchmark(name, BenchmarkSuite.SCENARIOS[name], frames).run(size))
+        connection.close()
+
+    def __init__(self, baseline_file_path: str = BASELINE_FILE_PATH, tolerance: typing.Optional[float] = None):
+        self.__logger = logging.getLogger(self.__class__.__name__)
+        self.__baseline_file_path = baseline_file_path
+        self.__baselines: typing.Dict[str, typing.Any] = {
+            "tolerance": BenchmarkSuite.DEFAULT_TOLERANCE,
+            "absoluteTolerance": BenchmarkSuite.DEFAULT_ABSOLUTE_TOLERANCE,
+            "metricTolerances": dict(BenchmarkSuite.DEFAULT_METRIC_TOLERANCES),
+            "scenarios": {}
+        }
+
+        if os.path.isfile(baseline_file_path):
+            with open(baseline_file_path, "r") as f:
+                self.__baselines.update(json.load(f))
+        if tolerance is not None:
+            self.__baselines["tolerance"] = tolerance
+            self.__baselines["metricTolerances"] = {}
+
+    @property
+    def baselines(self) -> typing.Dict[str, typing.Any]:
+        return self.__baselines
+
+    @staticmethod
+    def median_result(runs: typing.List[ResultType]) -> ResultType:
+        result: ResultType = {}
+        for metric in runs[0]:
+            values = [run[metric] for run in runs if run.get(metric) is not None]
+            result[metric] = statistics.median(values) if len(values) else None
+        return result
+
+    def run_once(self, name: str, frames: int, size: typing.Tuple[int, int]) -> typing.Optional[ResultType]:
+        # SDL traps the termination signal, so the scenario process has to exit on its own
+        context = multiprocessing.get_context("spawn")
+        (receiver, sender) = context.Pipe(duplex=False)
+        process = context.Process(target=BenchmarkSuite.run_scenario, args=(name, frames, size, sender))
+        process.start()
+        sender.close()
+        try:
+            result = receiver.recv()
+        except EOFError:
+            result = None
+        process.join()
+        if result is None or process.exitcode != 0:
+            self.__logger.error(f"Scenario {name} failed with exit code {process.exitcode}")
+            return None
+        return result
+
+    def run(self, names: typing.Iterable[str], frames: int, size: typing.Tuple[int, int],
+            repeat: int = DEFAULT_REPEAT) -> typing.Dict[str, typing.Optional[ResultType]]:
+        # Scenarios that crashed in any run are kept with a None result, so that they are reported as failed
+        results: typing.Dict[str, typing.Optional[ResultType]] = {}
+        for name in names:
+            runs = []
+            for _ in range(repeat):
+                result = self.run_once(name, frames, size)
+                if result is None:
+                    break
+                runs.append(result)
+            results[name] = BenchmarkSuite.median_result(runs) if len(runs) == repeat else None
+        return results
+
+    def regressions(self, results: typing.Dict[str, typing.Optional[ResultType]]) -> typing.List[str]:
+        tolerance = self.__baselines["tolerance"]
+        metric_tolerances = self.__baselines["metricTolerances"]
+        absolute_tolerance = self.__baselines["absoluteTolerance"]
+
+        regressions = []
+        for (name, result) in results.items():
+            if result is None:
+                regressions.append(f"{name} failed")
+                continue
+
+            baseline = self.__baselines["scenarios"].get(name)
+            if baseline is None:
+                self.__logger.warning(f"No baseline for {name}")
+                continue
+
+            for (metric, value) in result.items():
+                if value is None or baseline.get(metric) is None:
+                    continue
+                limit = baseline[metric] * (1 + metric_tolerances.get(metric, tolerance)) + absolute_tolerance
+                if value > limit:
+                    regressions.append(f"{name} {metric}: {value:.2f} exceeds {limit:.2f} "
+                                       f"(baseline {baseline[metric]:.2f})")
+        return regressions
+
+    def save_baselines(self, results: typing.Dict[str, typing.Optional[ResultType]]):
+        results = {name: result for (name, result) in results.items() if result is not None}
+        self.__baselines["scenarios"].update(
+            {name: {metric: value if value is None else round(value, 3) for (metric, value) in result.items()}
+             for (name, result) in results.items()}
+        )
+        with open(self.__baseline_file_path, "w") as f:
+            json.dump(self.__baselines, f, indent=2)
+            f.write("\n")
+        self.__logger.info(f"Saved baselines of {len(results)} scenarios to {self.__baseline_file_path}")
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import logging
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import typing
+
+import pygame
+
+from core.object_model.Scene import Scene
+from core.object_model.Stage import Stage
+from util.HeadlessRunner import HeadlessRunner
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, where peak memory is not reported
+    resource = None
+
+ResultType: typing.TypeAlias = typing.Dict[str, typing.Optional[float]]
+
+
+class SceneBenchmark:
+    """
+    Builds a scene headless and times `update` and `render` separately over a number of ticks.
+
+    The first `warmup_frames` ticks are run but not measured, so that lazily built caches do not skew the result.
+    Events are dropped every tick, so the scene is never replaced by the one it requests.
+    Results are in milliseconds, except `peak_rss`, which is the peak resident set size of the process in MiB, and
+    `scene_memory`, which is the Python heap held by the scene in MiB.
+    """
+    PERCENTILES = (50, 95, 99)
+    SEED = 0
+
+    @staticmethod
+    def percentiles(samples: typing.List[float]) -> typing.List[float]:
+        cut_points = statistics.quantiles(samples, n=100, method="inclusive")
+        return [cut_points[percentile - 1] for percentile in SceneBenchmark.PERCENTILES]
+
+    @staticmethod
+    def peak_rss() -> typing.Optional[float]:
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Bytes on macOS, kibibytes everywhere else
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+    def scene_memory(self, size: typing.Tuple[int, int]) -> float:
+        # Measured on a second build, when the asset caches are warm, so that only the scene's own objects count
+        tracemalloc.start()
+        try:
+            scene = self.__scene_factory(size)
+            (current, _) = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del scene
+        return current / (1024 * 1024)
+
+    def __init__(self, name: str, scene_factory: typing.Callable[[typing.Tuple[int, int]], Scene],
+                 frames: int = 300, warmup_frames: int = 30):
+        self.__logger = logging.getLogger(self.__class__.__name__)
+        self.__name = name
+        self.__scene_factory = scene_factory
+        self.__frames = frames
+        self.__warmup_frames = warmup_frames
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    def run(self, size: typing.Tuple[int, int]) -> ResultType:
+        surface = HeadlessRunner.create_display_surface(size)
+        # Random maps and spawns come out the same on every run
+        random.seed(SceneBenchmark.SEED)
+
+        start_time = time.perf_counter()
+        stage = Stage(surface)
+        stage.scene = self.__scene_factory(size)
+        build_time = time.perf_counter() - start_time
+
+        update_times = []
+        render_times = []
+        scene = stage.scene
+        for frame in range(self.__warmup_frames + self.__frames):
+            pygame.event.clear()
+
+            start_time = time.perf_counter()
+            scene.snapshot()
+            scene.update()
+            update_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            scene.render(surface)
+            render_time = time.perf_counter() - start_time
+
+            if frame >= self.__warmup_frames:
+                update_times.append(update_time * 1000)
+                render_times.append(render_time * 1000)
+
+        result: ResultType = {"build": build_time * 1000}
+        for (phase, samples) in (("update", update_times), ("render", render_times)):
+            for (percentile, value) in zip(SceneBenchmark.PERCENTILES, SceneBenchmark.percentiles(samples)):
+                result[f"{phase}_p{percentile}"] = value
+        result["peak_rss"] = SceneBenchmark.peak_rss()
+        result["scene_memory"] = self.scene_memory(size)
+
+        self.__logger.info(f"{self.__name}: " + ", ".join(
+            f"{key} {value:.2f}" for (key, value) in result.items() if value is not None))
+        return result
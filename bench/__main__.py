@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import argparse
+import logging
+import sys
+
+from bench.BenchmarkSuite import BenchmarkSuite
+from config.ConfigManager import ConfigManager
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Pickle Rush scene benchmarks")
+    parser.add_argument("scenarios", nargs="*", default=list(BenchmarkSuite.SCENARIOS),
+                        help=f"scenarios to run, all by default: {', '.join(BenchmarkSuite.SCENARIOS)}")
+    parser.add_argument("--frames", type=int, default=300,
+                        help="number of measured ticks per scenario")
+    parser.add_argument("--repeat", type=int, default=BenchmarkSuite.DEFAULT_REPEAT,
+                        help="number of runs per scenario, of which the median is compared")
+    parser.add_argument("--baselines", default=BenchmarkSuite.BASELINE_FILE_PATH,
+                        help="baseline file to compare against")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="allowed relative regression of every metric, overriding the ones stored with the "
+                             "baselines")
+    parser.add_argument("--update-baselines", action="store_true",
+                        help="store the results as the new baselines instead of comparing")
+    return parser.parse_args()
+
+
+def main() -> int:
+    arguments = parse_arguments()
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s][%(levelname)s][%(name)s] %(message)s")
+    logger = logging.getLogger()
+
+    unknown_scenarios = [name for name in arguments.scenarios if name not in BenchmarkSuite.SCENARIOS]
+    if len(unknown_scenarios):
+        logger.error(f"Unknown scenarios: {', '.join(unknown_scenarios)}")
+        return 2
+
+    config_manager = ConfigManager()
+    size = (config_manager.get("config.graphics.resolution.width"),
+            config_manager.get("config.graphics.resolution.height"))
+
+    suite = BenchmarkSuite(arguments.baselines, arguments.tolerance)
+    results = suite.run(arguments.scenarios, arguments.frames, size, arguments.repeat)
+
+    if arguments.update_baselines:
+        suite.save_baselines(results)
+        # Failed scenarios keep their previous baselines, but still fail the run
+        return 1 if None in results.values() else 0
+
+    regressions = suite.regressions(results)
+    for regression in regressions:
+        logger.error(f"Regression: {regression}")
+    return 1 if len(regressions) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
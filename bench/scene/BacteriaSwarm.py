@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+import random
+import typing
+
+from core.object_model.AtlasPool import AtlasPool
+from game.atlas.BacteriaAtlasGravity import BacteriaAtlasGravity
+from game.scene.Level2 import Level2
+from util.PatrolNavigator import PatrolNavigator
+
+
+class BacteriaSwarm(Level2):
+    """
+    `Level2` with the enemy layer kept at `bacteria_count` falling and patrolling bacteria.
+    """
+    BACTERIA_COUNT = 200
+
+    def __init__(self, size: typing.Tuple[int, int], bacteria_count: int = BACTERIA_COUNT):
+        super().__init__(size)
+        self.__bacteria_count = bacteria_count
+        self.__enemy_layer = self.layer_manager["enemy"]
+        self.__bacteria_pool = AtlasPool(BacteriaAtlasGravity, bacteria_count)
+        self.__map_atlas = self.layer_manager["map"].atlases[0]
+        self.__random = random.Random(0)
+
+        self.replenish()
+
+    def replenish(self):
+        (width, height) = self.__map_atlas.size
+        while len(self.__enemy_layer.atlases) < self.__bacteria_count:
+            bacteria = self.__bacteria_pool.acquire()
+            bacteria.position = (self.__random.uniform(0, width), self.__random.uniform(0, height / 2))
+            bacteria.speed = (self.__random.uniform(-3, 3), self.__random.uniform(-3, 0))
+            bacteria.map_navigator = PatrolNavigator(bacteria, self.__map_atlas, (2, 18))
+            self.__enemy_layer.add_atlas(bacteria)
+
+    def update(self):
+        super().update()
+        self.replenish()
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+import random
+import typing
+
+from asset.AssetObjectFactory import AssetObjectFactory
+from core.object_model.AtlasPool import AtlasPool
+from game.atlas.BulletAtlas import BulletAtlas
+from game.scene.Level2 import Level2
+
+
+class BulletStorm(Level2):
+    """
+    `Level2` with the player's bullet layer kept at `bullet_count` bullets flying in random directions.
+    """
+    BULLET_COUNT = 1000
+
+    def __init__(self, size: typing.Tuple[int, int], bullet_count: int = BULLET_COUNT):
+        super().__init__(size)
+        self.__bullet_count = bullet_count
+        self.__bullet_layer = self.layer_manager["bullet"]
+        self.__bullet_pool = AtlasPool(
+            lambda: BulletAtlas(AssetObjectFactory().new_asset_object("asset.sprite.pickle-projectile")),
+            bullet_count
+        )
+        self.__map_size = self.layer_manager["map"].atlases[0].size
+        self.__random = random.Random(0)
+
+        self.replenish()
+
+    def replenish(self):
+        (width, height) = self.__map_size
+        while len(self.__bullet_layer.atlases) < self.__bullet_count:
+            bullet = self.__bullet_pool.acquire()
+            bullet.scale = (0.02, 0.02)
+            bullet.position = (self.__random.uniform(0, width), self.__random.uniform(0, height))
+            bullet.speed = (self.__random.uniform(-5, 5), self.__random.uniform(-5, 5))
+            self.__bullet_layer.add_atlas(bullet)
+
+    def update(self):
+        super().update()
+        # Bullets leaving the map or hitting an enemy are replaced, so the load stays the same every step
+        self.replenish()
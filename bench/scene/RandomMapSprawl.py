@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import typing
+
+import pygame
+
+from asset.AssetObjectFactory import AssetObjectFactory
+from core.object_model.Atlas import Atlas
+from core.object_model.Camera import Camera
+from core.object_model.Layer import Layer
+from core.object_model.Map import Map
+from core.object_model.Scene import Scene
+from game.atlas.MapAtlas import MapAtlas
+
+
+class RandomMapSprawl(Scene):
+    """
+    A randomly generated map of `tile_count` tiles, scrolled diagonally by a camera that follows a probe atlas.
+
+    The probe queries the tile grid for walls every step, and wraps around at the far corner of the map.
+    """
+    TILE_COUNT = (200, 200)
+    PROBE_SPEED = 12
+
+    def __init__(self, size: typing.Tuple[int, int], tile_count: typing.Tuple[int, int] = TILE_COUNT):
+        super().__init__(size)
+
+        ao = AssetObjectFactory()
+        self.background["background"] = ao.new_asset_object("asset.sprite.level.0.plus.background")
+
+        texture_dict = {
+            Map.TileType.SPACE: ao.new_asset_object("asset.sprite.level.0.tile.soil"),
+            Map.TileType.WALL: ao.new_asset_object("asset.sprite.level.0.tile.wall"),
+            Map.TileType.EXIT: ao.new_asset_object("asset.sprite.level.0.tile.exit"),
+            Map.TileType.START: ao.new_asset_object("asset.sprite.level.0.tile.spawn")
+        }
+
+        self.__map_atlas = MapAtlas(ao.new_asset_object("asset.map.random", tile_count=tile_count), texture_dict)
+        self.__map_atlas.position = (0, 0)
+
+        self.__probe = Atlas(ao.new_asset_object("asset.sprite.bacteria"))
+        self.__probe.scale_to((30, 30))
+        self.__probe.speed = (RandomMapSprawl.PROBE_SPEED, RandomMapSprawl.PROBE_SPEED * size[1] / size[0])
+
+        self.__camera = Camera(size, self.__probe, self.__map_atlas.size)
+        self.__camera.ONLY_TRACK_X = False
+        self.__camera.update_move_boundary()
+        self.__wall_hits = 0
+
+        self.layer_manager["map"] = Layer(self.__map_atlas)
+        self.layer_manager["entity"] = Layer(self.__probe)
+
+    @property
+    def wall_hits(self) -> int:
+        return self.__wall_hits
+
+    def update(self):
+        super().update()
+
+        (width, height) = self.__map_atlas.size
+        if self.__probe.position_x > width or self.__probe.position_y > height:
+            self.__probe.position = (0, 0)
+
+        if self.__map_atlas.collides_tile_type(self.__probe, Map.TileType.WALL):
+            self.__wall_hits += 1
+
+    def render(self, surface: pygame.surface.Surface, interpolation: float = 1.0):
+        self.background.render(surface)
+        self.layer_manager.render(surface, self.__camera.get_view_rect(interpolation), interpolation)
@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+# The game scenes import each other in a cycle that only resolves when entered through the menu, as main does
+import game.scene.Menu
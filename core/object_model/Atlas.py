@@ -5,24 +5,50 @@ import typing
 
 import pygame
 
+from core.object_model.DrawList import DrawList
 from core.object_model.Sprite import Sprite
+from core.object_model.SurfaceCache import SurfaceCache, SurfaceCacheEntry
+
+if typing.TYPE_CHECKING:
+    from core.object_model.AtlasPool import AtlasPool
+    from core.object_model.EntityStore import EntityStore
 
 
 class Atlas:
+    # Entities are spawned by the thousand, so they go without a per-instance dict
+    __slots__ = ("__RECT_MASK", "__SHOW_COLLIDE_BODY", "__COLLIDABLE", "__sprite_dict", "__surface_cache",
+                 "__cached_sprite_entries", "__stale_sprite_keys", "__current_sprite_key", "__current_entry",
+                 "__position", "__previous_position", "__speed", "__acceleration", "__opacity", "__scale",
+                 "__entity_store", "__entity_row", "__pool", "__drawn_rect", "__drawn_entry")
+
     def __init__(self, default_sprite: typing.Optional[Sprite] = None, **kwargs):
         self.__RECT_MASK: bool = False
         self.__SHOW_COLLIDE_BODY: bool = False
+        self.__COLLIDABLE: bool = True
 
         self.__sprite_dict: typing.Dict[str, Sprite] = {}
-        self.__cached_sprite_surfaces: typing.Dict[str, pygame.surface.Surface] = {}
-        self.__cached_sprite_masks: typing.Dict[str, pygame.mask.Mask] = {}
+        self.__surface_cache = SurfaceCache()
+        self.__cached_sprite_entries: typing.Dict[str, SurfaceCacheEntry] = {}
+        # Sprites whose entry no longer matches the scale, opacity or mask mode; rebuilt when next used
+        self.__stale_sprite_keys: typing.Set[str] = set()
         self.__current_sprite_key: typing.Optional[str] = None
+        # Entry of the current sprite, saving the dict lookup on every draw; None until resolved
+        self.__current_entry: typing.Optional[SurfaceCacheEntry] = None
 
+        # Kinematic state is only accessed by index, so that it can be swapped for a row of an EntityStore
         self.__position = pygame.Vector2(0, 0)
+        # Position at the start of the current simulation step, for interpolated rendering
+        self.__previous_position = pygame.Vector2(0, 0)
         self.__speed = pygame.Vector2(0, 0)
         self.__acceleration = pygame.Vector2(0, 0)
-        self.__opacity: int = 255
+        self.__opacity: typing.MutableSequence[int] = [255]
         self.__scale = pygame.Vector2(1, 1)
+        self.__entity_store: typing.Optional[EntityStore] = None
+        self.__entity_row = -1
+        self.__pool: typing.Optional[AtlasPool] = None
+        # Where and what the atlas was drawn last, for dirty rect tracking
+        self.__drawn_rect: typing.Optional[typing.Tuple[int, int, int, int]] = None
+        self.__drawn_entry: typing.Optional[SurfaceCacheEntry] = None
 
         if default_sprite is not None:
             self["default"] = default_sprite
@@ -39,6 +65,15 @@ class Atlas:
     def SHOW_COLLIDE_BODY(self, value: bool):
         self.__SHOW_COLLIDE_BODY = value
 
+    @property
+    def COLLIDABLE(self):
+        return self.__COLLIDABLE
+
+    @COLLIDABLE.setter
+    def COLLIDABLE(self, value: bool):
+        # Atlases that are only drawn never collide, and never have a mask built
+        self.__COLLIDABLE = value
+
     @property
     def RECT_MASK(self):
         return self.__RECT_MASK
@@ -46,94 +81,141 @@ class Atlas:
     @RECT_MASK.setter
     def RECT_MASK(self, value):
         self.__RECT_MASK = value
+        self.update_surface_cache()
 
     @property
     def mask(self):
-        return self.__cached_sprite_masks[self.__current_sprite_key]
+        return self.current_entry().mask
+
+    @property
+    def box_collider(self) -> bool:
+        # Without RECT_MASK the mask covers the whole surface, so the bounding box answers collisions just the same
+        return not self.__RECT_MASK
+
+    @staticmethod
+    def box_overlap(size: typing.Tuple[int, int], offset: typing.Tuple[float, float],
+                    other_size: typing.Tuple[int, int]) -> typing.Optional[typing.Tuple[int, int]]:
+        # Same answer as overlapping two full masks: the first overlapping point, relative to the first box
+        (offset_x, offset_y) = (int(offset[0]), int(offset[1]))
+        if offset_x >= size[0] or offset_x + other_size[0] <= 0 \
+                or offset_y >= size[1] or offset_y + other_size[1] <= 0:
+            return None
+        return max(offset_x, 0), max(offset_y, 0)
 
     @property
     def surface(self) -> pygame.surface.Surface:
-        return self.__cached_sprite_surfaces[self.__current_sprite_key]
+        return self.current_entry().surface
+
+    @property
+    def surface_cache_entries(self) -> typing.List[SurfaceCacheEntry]:
+        # Sprites that were never used are left unbuilt
+        self.current_entry()
+        return [entry for (key, entry) in self.__cached_sprite_entries.items() if key not in self.__stale_sprite_keys]
+
+    @property
+    def rect(self) -> pygame.Rect:
+        return pygame.Rect(self.position_int, self.surface.get_size())
 
     @property
     def position(self) -> typing.Tuple[float, float]:
-        return self.__position.x, self.__position.y
+        return self.__position[0], self.__position[1]
 
     @property
     def position_int(self) -> typing.Tuple[int, int]:
-        return int(self.__position.x), int(self.__position.y)
+        return int(self.__position[0]), int(self.__position[1])
 
     @position.setter
     def position(self, value: typing.Tuple[float, float]):
-        self.__position.update(value)
+        # Same semantics as Vector2.update, which also accepts a single scalar
+        self.__position[:] = pygame.Vector2(value)
+        # Assigning the whole position is a teleport, which is not interpolated
+        self.__previous_position[:] = self.__position
+
+    @property
+    def previous_position(self) -> typing.Tuple[float, float]:
+        return self.__previous_position[0], self.__previous_position[1]
+
+    def translate(self, offset: typing.Tuple[float, float]):
+        # Moves without touching the previous position, so that the motion is interpolated unlike `position = ...`
+        self.__position[0] += offset[0]
+        self.__position[1] += offset[1]
+
+    def snapshot(self):
+        self.__previous_position[:] = self.__position
+
+    def interpolated_position(self, interpolation: float) -> typing.Tuple[float, float]:
+        # Interpolated from the current position backwards, so that an interpolation of 1 is exact
+        rewind = 1 - interpolation
+        return (self.__position[0] - (self.__position[0] - self.__previous_position[0]) * rewind,
+                self.__position[1] - (self.__position[1] - self.__previous_position[1]) * rewind)
 
     @property
     def position_x(self) -> float:
-        return self.__position.x
+        return self.__position[0]
 
     @position_x.setter
     def position_x(self, value: float):
-        self.__position.x = value
+        self.__position[0] = value
 
     @property
     def position_y(self) -> float:
-        return self.__position.y
+        return self.__position[1]
 
     @position_y.setter
     def position_y(self, value: float):
-        self.__position.y = value
+        self.__position[1] = value
 
     @property
     def speed(self) -> typing.Tuple[float, float]:
-        return self.__speed.x, self.__speed.y
+        return self.__speed[0], self.__speed[1]
 
     @speed.setter
     def speed(self, value: typing.Tuple[float, float]):
-        self.__speed.update(value)
+        self.__speed[:] = pygame.Vector2(value)
 
     @property
     def speed_x(self) -> float:
-        return self.__speed.x
+        return self.__speed[0]
 
     @speed_x.setter
     def speed_x(self, value: float):
-        self.__speed.x = value
+        self.__speed[0] = value
 
     @property
     def speed_y(self) -> float:
-        return self.__speed.y
+        return self.__speed[1]
 
     @speed_y.setter
     def speed_y(self, value: float):
-        self.__speed.y = value
+        self.__speed[1] = value
 
     @property
     def acceleration(self):
-        return self.__acceleration.x, self.__acceleration.y
+        return self.__acceleration[0], self.__acceleration[1]
 
     @acceleration.setter
     def acceleration(self, value: typing.Tuple[float, float]):
-        self.__acceleration.update(value)
+        self.__acceleration[:] = pygame.Vector2(value)
 
     @property
     def acceleration_x(self) -> float:
-        return self.__acceleration.x
+        return self.__acceleration[0]
 
     @acceleration_x.setter
     def acceleration_x(self, value: float):
-        self.__acceleration.x = value
+        self.__acceleration[0] = value
 
     @property
     def acceleration_y(self) -> float:
-        return self.__acceleration.y
+        return self.__acceleration[1]
 
     @acceleration_y.setter
     def acceleration_y(self, value: float):
-        self.__acceleration.y = value
+        self.__acceleration[1] = value
 
     @property
     def opacity(self):
-        return self.__opacity
+        return int(self.__opacity[0])
 
     @opacity.setter
     def opacity(self, value: int):
@@ -141,34 +223,34 @@ class Atlas:
             value = 255
         if value < 0:
             value = 0
-        self.__opacity = value
+        self.__opacity[0] = value
         self.update_surface_cache_opacity()
 
     @property
     def scale(self):
-        return self.__scale.x, self.__scale.y
+        return self.__scale[0], self.__scale[1]
 
     @scale.setter
     def scale(self, value: typing.Tuple[float, float]):
-        self.__scale.update(value)
+        self.__scale[:] = pygame.Vector2(value)
         self.update_surface_cache_scale()
 
     @property
     def scale_x(self) -> float:
-        return self.__scale.x
+        return self.__scale[0]
 
     @scale_x.setter
     def scale_x(self, value: float):
-        self.__scale.x = value
+        self.__scale[0] = value
         self.update_surface_cache_scale()
 
     @property
     def scale_y(self) -> float:
-        return self.__scale.y
+        return self.__scale[1]
 
     @scale_y.setter
     def scale_y(self, value: float):
-        self.__scale.y = value
+        self.__scale[1] = value
         self.update_surface_cache_scale()
 
     @property
@@ -178,69 +260,207 @@ class Atlas:
     @current_sprite_key.setter
     def current_sprite_key(self, value: typing.Optional[str]):
         self.__current_sprite_key = value
+        self.__current_entry = None
+
+    @property
+    def pool(self) -> typing.Optional[AtlasPool]:
+        return self.__pool
+
+    @pool.setter
+    def pool(self, value: typing.Optional[AtlasPool]):
+        self.__pool = value
+
+    def recycle(self):
+        # Hands the atlas back to the pool it was acquired from, if any
+        if self.__pool is not None:
+            self.__pool.release(self)
+
+    def on_despawn(self):
+        self.release_surface_cache()
+        self.recycle()
+
+    def reset(self):
+        self.__position[:] = (0, 0)
+        self.__previous_position[:] = (0, 0)
+        self.__speed[:] = (0, 0)
+        self.__acceleration[:] = (0, 0)
+
+    @property
+    def entity_store(self) -> typing.Optional[EntityStore]:
+        return self.__entity_store
+
+    @property
+    def entity_row(self) -> int:
+        return self.__entity_row
+
+    def bind_entity_store(self, entity_store: EntityStore, row: int, position: typing.MutableSequence[float],
+                          previous_position: typing.MutableSequence[float], speed: typing.MutableSequence[float],
+                          acceleration: typing.MutableSequence[float],
+                          scale: typing.MutableSequence[float], opacity: typing.MutableSequence[int]):
+        # Called by the store whenever the row moves; the arguments are views onto that row
+        self.__entity_store = entity_store
+        self.__entity_row = row
+        self.__position = position
+        self.__previous_position = previous_position
+        self.__speed = speed
+        self.__acceleration = acceleration
+        self.__scale = scale
+        self.__opacity = opacity
+
+    def unbind_entity_store(self):
+        self.__entity_store = None
+        self.__entity_row = -1
+        self.__position = pygame.Vector2(self.__position[0], self.__position[1])
+        self.__previous_position = pygame.Vector2(self.__previous_position[0], self.__previous_position[1])
+        self.__speed = pygame.Vector2(self.__speed[0], self.__speed[1])
+        self.__acceleration = pygame.Vector2(self.__acceleration[0], self.__acceleration[1])
+        self.__scale = pygame.Vector2(self.__scale[0], self.__scale[1])
+        self.__opacity = [int(self.__opacity[0])]
 
     def scale_to(self, size: typing.Tuple[int, int]):
         (width, height) = size
-        self.scale_x = width / self.surface.get_width()
-        self.scale_y = height / self.surface.get_height()
+        # Measured on the source, so that both axes are set at once and the current scale does not matter
+        source = self.__sprite_dict[self.__current_sprite_key].surface
+        self.scale = (width / source.get_width(), height / source.get_height())
 
     def update_surface_cache_scale(self, key: typing.Optional[str] = None):
-        iterable = self.__sprite_dict
-        if key is not None:
-            iterable = {key: self.__sprite_dict[key]}
-
-        for key, sprite in iterable.items():
-            self.__cached_sprite_surfaces[key] = pygame.transform.scale(
-                sprite.surface,
-                (self.__scale.x * sprite.surface.get_width(),
-                 self.__scale.y * sprite.surface.get_height())
-            )
-            if self.__RECT_MASK:
-                self.__cached_sprite_masks[key] = pygame.mask.from_surface(
-                    self.__cached_sprite_surfaces[key])
-            else:
-                self.__cached_sprite_masks[key] = pygame.mask.Mask(
-                    self.__cached_sprite_surfaces[key].get_size(), True)
+        self.update_surface_cache(key)
 
     def update_surface_cache_opacity(self, key: typing.Optional[str] = None):
-        iterable = self.__cached_sprite_surfaces.values()
-        if key is not None:
-            iterable = [self.__cached_sprite_surfaces[key]]
-
-        for surface in iterable:
-            surface.set_alpha(self.__opacity)
+        self.update_surface_cache(key)
 
     def update_surface_cache(self, key: typing.Optional[str] = None):
-        self.update_surface_cache_scale(key)
-        self.update_surface_cache_opacity(key)
+        # Entries are only marked here and rebuilt when drawn or collided, so changes in between cost one rebuild
+        if key is None:
+            self.__stale_sprite_keys.update(self.__sprite_dict.keys())
+        else:
+            self.__stale_sprite_keys.add(key)
+        if self.__current_sprite_key in self.__stale_sprite_keys:
+            self.__current_entry = None
+
+    def surface_cache_entry(self, key: str) -> SurfaceCacheEntry:
+        if key in self.__stale_sprite_keys:
+            self.build_surface_cache_entry(key)
+        return self.__cached_sprite_entries[key]
+
+    def current_entry(self) -> typing.Optional[SurfaceCacheEntry]:
+        if self.__current_entry is None and self.__current_sprite_key is not None:
+            self.__current_entry = self.surface_cache_entry(self.__current_sprite_key)
+        return self.__current_entry
+
+    def build_surface_cache_entry(self, key: str):
+        surface = self.__sprite_dict[key].surface
+        size = (int(self.__scale[0] * surface.get_width()), int(self.__scale[1] * surface.get_height()))
+        entry = self.__surface_cache.acquire(surface, size, self.__RECT_MASK, int(self.__opacity[0]))
+        self.release_surface_cache(key)
+        self.__cached_sprite_entries[key] = entry
+        self.__stale_sprite_keys.discard(key)
+
+    def release_surface_cache(self, key: typing.Optional[str] = None):
+        keys = list(self.__cached_sprite_entries.keys())
+        if key is not None:
+            keys = [key] if key in self.__cached_sprite_entries else []
+
+        for key in keys:
+            self.__surface_cache.release(self.__cached_sprite_entries.pop(key))
+            # Released sprites are rebuilt if the atlas is drawn or collided again, e.g. after being recycled
+            if key in self.__sprite_dict:
+                self.__stale_sprite_keys.add(key)
+            if key == self.__current_sprite_key:
+                self.__current_entry = None
 
     def collides_atlas(self, other: Atlas) -> typing.Optional[typing.Tuple[int, int]]:
+        if not self.__COLLIDABLE or not other.__COLLIDABLE:
+            return None
+
+        offset = (other.__position[0] - self.__position[0], other.__position[1] - self.__position[1])
+        if self.box_collider and other.box_collider:
+            return Atlas.box_overlap(self.surface.get_size(), offset, other.surface.get_size())
         # noinspection PyTypeChecker
-        return self.__cached_sprite_masks[self.__current_sprite_key].overlap(
-            other.__cached_sprite_masks[other.__current_sprite_key],
-            other.__position - self.__position
+        return self.mask.overlap(
+            other.mask,
+            offset
         )
 
     def collides_mask(self, mask: pygame.mask.Mask, offset: pygame.Vector2) -> typing.Optional[
         typing.Tuple[int, int]]:
+        if not self.__COLLIDABLE:
+            return None
         # noinspection PyTypeChecker
-        return self.__cached_sprite_masks[self.__current_sprite_key].overlap(
+        return self.mask.overlap(
             mask,
             offset
         )
 
-    def render(self, surface: pygame.surface.Surface):
-        if self.__current_sprite_key is None:
+    def collides_box(self, size: typing.Tuple[int, int], offset: typing.Tuple[float, float]) -> typing.Optional[
+        typing.Tuple[int, int]]:
+        if not self.__COLLIDABLE:
+            return None
+        if self.box_collider:
+            return Atlas.box_overlap(self.surface.get_size(), offset, size)
+        return self.mask.overlap(pygame.mask.Mask(size, True), offset)
+
+    def track_dirty_rect(self, draw_list: DrawList, entry: typing.Optional[SurfaceCacheEntry],
+                         rect: typing.Optional[typing.Tuple[int, int, int, int]]):
+        # Moving, switching sprites or changing opacity dirties both the area left and the area drawn
+        if entry is self.__drawn_entry and rect == self.__drawn_rect:
+            return
+        if self.__drawn_rect is not None:
+            draw_list.dirty_rects.append(pygame.Rect(self.__drawn_rect))
+        if rect is not None:
+            draw_list.dirty_rects.append(pygame.Rect(rect))
+        self.__drawn_entry = entry
+        self.__drawn_rect = rect
+
+    def forget_drawn_rect(self) -> typing.Optional[pygame.Rect]:
+        # Called when the atlas stops being collected; returns the area it leaves behind, which has to be redrawn
+        rect = self.__drawn_rect
+        self.__drawn_rect = None
+        self.__drawn_entry = None
+        return pygame.Rect(rect) if rect is not None else None
+
+    def collect(self, draw_list: DrawList, view_rect: typing.Optional[pygame.Rect] = None):
+        entry = self.__current_entry
+        if entry is None:
+            entry = self.current_entry()
+        if entry is None:
+            if draw_list.dirty_rects is not None:
+                self.track_dirty_rect(draw_list, None, None)
             return
-        surface.blit(self.__cached_sprite_surfaces[self.__current_sprite_key], self.position_int)
+
+        (x, y) = self.interpolated_position(draw_list.interpolation)
+        x = int(x)
+        y = int(y)
+        if view_rect is not None:
+            # Atlases outside the view are culled; the others are drawn relative to the view origin
+            if not view_rect.colliderect(x, y, *entry.surface.get_size()):
+                if draw_list.dirty_rects is not None:
+                    self.track_dirty_rect(draw_list, None, None)
+                return
+            x -= view_rect.x
+            y -= view_rect.y
+        if draw_list.dirty_rects is not None:
+            self.track_dirty_rect(draw_list, entry, (x, y, *entry.surface.get_size()))
+        # Packed surfaces are drawn as a sub-rect of their texture sheet
+        draw_list.blit_entries.append((entry.sheet, (x, y), entry.area))
 
         # for debug use
-        if self.SHOW_COLLIDE_BODY:
-            outline = self.mask.outline()
-            outline = [(t[0] + self.position_x, t[1] + self.position_y) for t in outline]
-            pygame.draw.lines(surface, (0, 0, 255), True, outline, 3)
+        if self.__SHOW_COLLIDE_BODY:
+            # The outline is cached along with the mask, so only its translation is done per frame
+            outline = entry.outline
+            if len(outline) > 1:
+                draw_list.debug_entries.append(((0, 0, 255), [(px + x, py + y) for (px, py) in outline], 3))
+
+    def render(self, surface: pygame.surface.Surface, view_rect: typing.Optional[pygame.Rect] = None,
+               interpolation: float = 1.0):
+        draw_list = DrawList(interpolation)
+        self.collect(draw_list, view_rect)
+        draw_list.submit(surface)
 
     def update(self):
+        if self.__entity_store is not None:
+            # Integrated in bulk by the store
+            return
         self.__speed += self.__acceleration
         self.__position += self.__speed
 
@@ -266,10 +486,17 @@ class Atlas:
 
     def __delitem__(self, key: str):
         del self.__sprite_dict[key]
-        del self.__cached_sprite_surfaces[key]
+        self.__stale_sprite_keys.discard(key)
+        self.release_surface_cache(key)
         if self.__current_sprite_key == key:
             self.current_sprite_key = None
 
+    def __del__(self):
+        # Owners release shared surfaces on despawn, recycling and scene teardown; this only catches atlases that
+        # never went through any of them. A subclass may fail before `Atlas.__init__` has set the slots
+        if getattr(self, "_Atlas__cached_sprite_entries", None):
+            self.release_surface_cache()
+
     def __cmp__(self, other: Atlas):
         return self.__cmp__(other)
 
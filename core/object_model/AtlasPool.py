@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import typing
+
+if typing.TYPE_CHECKING:
+    from core.object_model.Atlas import Atlas
+
+AtlasType = typing.TypeVar("AtlasType", bound="Atlas")
+
+
+class AtlasPool(typing.Generic[AtlasType]):
+    """
+    Recycles atlases of one kind, so that spawning does not rebuild sprites, masks and vectors every time.
+
+    `acquire` hands out an idle instance reset to its initial state, or builds one with `factory` when none is idle.
+    Atlases come back through `release` (or `Atlas.recycle`); at most `max_size` idle instances are kept.
+    """
+    MAX_SIZE = 256
+
+    def __init__(self, factory: typing.Callable[[], AtlasType], max_size: int = MAX_SIZE):
+        self.__factory = factory
+        self.__max_size = max_size
+        self.__idle: typing.List[AtlasType] = []
+        self.__live_count = 0
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__peak = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.__idle)
+
+    @property
+    def live_count(self) -> int:
+        return self.__live_count
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    @property
+    def peak(self) -> int:
+        return self.__peak
+
+    def acquire(self) -> AtlasType:
+        if len(self.__idle):
+            self.__hits += 1
+            atlas = self.__idle.pop()
+            atlas.reset()
+        else:
+            self.__misses += 1
+            atlas = self.__factory()
+
+        atlas.pool = self
+        self.__live_count += 1
+        self.__peak = max(self.__peak, self.__live_count)
+        return atlas
+
+    def release(self, atlas: AtlasType):
+        if atlas.pool is not self:
+            return
+
+        atlas.pool = None
+        self.__live_count -= 1
+        # Idle atlases do not hold on to shared surfaces; they are rebuilt when the atlas is drawn again
+        atlas.release_surface_cache()
+        if len(self.__idle) < self.__max_size:
+            self.__idle.append(atlas)
+
+    def clear(self):
+        self.__idle.clear()
+
+    def __repr__(self):
+        return f"AtlasPool(size={len(self.__idle)}, live={self.__live_count}, misses={self.__misses}, " \
+               f"peak={self.__peak})"
@@ -21,21 +21,31 @@ class Camera:
         self.__move_boundary_y = None
         self.update_move_boundary()
 
-    def get_render_params(self) -> tuple[int, ...]:
+    def get_render_params(self, interpolation: float = 1.0) -> tuple[int, ...]:
         x, y = 0, 0
+        if self.__target:
+            # Follows the target where it is drawn, not where the last simulation step left it
+            target_x, target_y = self.__target.interpolated_position(interpolation)
         if self.__target and self.__world_size:
-            x = min(max(int(self.__target.position_x - self.__size_x / 2), 0),
+            x = min(max(int(target_x - self.__size_x / 2), 0),
                     self.__move_boundary_x)
-            y = min(max(int(self.__target.position_y - self.__size_y / 2), 0),
+            y = min(max(int(target_y - self.__size_y / 2), 0),
                     self.__move_boundary_y)
         elif self.__target:
-            x = max(int(self.__target.position_x - self.__size_x / 2), 0)
-            y = max(int(self.__target.position_y - self.__size_y / 2), 0)
+            x = max(int(target_x - self.__size_x / 2), 0)
+            y = max(int(target_y - self.__size_y / 2), 0)
         width, height = self.__size
         if self.ONLY_TRACK_X:
             y = 0
         return tuple([x, y, width, height])
 
+    @property
+    def view_rect(self) -> pygame.Rect:
+        return pygame.Rect(self.get_render_params())
+
+    def get_view_rect(self, interpolation: float = 1.0) -> pygame.Rect:
+        return pygame.Rect(self.get_render_params(interpolation))
+
     @property
     def world_size(self):
         return self.world_size
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import typing
+
+import pygame
+
+BlitEntryType: typing.TypeAlias = typing.Tuple[pygame.surface.Surface, typing.Tuple[int, int],
+                                               typing.Optional[pygame.Rect]]
+# Closed polyline: (color, points, width)
+DebugEntryType: typing.TypeAlias = typing.Tuple[typing.Tuple[int, int, int], typing.List[typing.Tuple[float, float]],
+                                                int]
+
+
+class DrawList:
+    """
+    Draws collected for one frame, submitted to a surface in one go.
+
+    Atlases append (surface, dest, area) entries during the collect phase; `submit` then hands all of them to a
+    single `Surface.blits` call. Debug overlays are kept in a separate list and drawn on top.
+    `interpolation` is how far the frame lies between the previous and the current simulation step.
+    With `track_dirty_rects`, atlases also report the screen areas that changed since they were last collected.
+    """
+
+    def __init__(self, interpolation: float = 1.0, track_dirty_rects: bool = False):
+        self.__blit_entries: typing.List[BlitEntryType] = []
+        self.__debug_entries: typing.List[DebugEntryType] = []
+        self.__dirty_rects: typing.Optional[typing.List[pygame.Rect]] = [] if track_dirty_rects else None
+        self.__interpolation = interpolation
+
+    @property
+    def interpolation(self) -> float:
+        return self.__interpolation
+
+    @interpolation.setter
+    def interpolation(self, value: float):
+        self.__interpolation = value
+
+    @property
+    def blit_entries(self) -> typing.List[BlitEntryType]:
+        return self.__blit_entries
+
+    @property
+    def debug_entries(self) -> typing.List[DebugEntryType]:
+        return self.__debug_entries
+
+    @property
+    def dirty_rects(self) -> typing.Optional[typing.List[pygame.Rect]]:
+        return self.__dirty_rects
+
+    def submit(self, surface: pygame.surface.Surface):
+        surface.blits(self.__blit_entries, False)
+        [pygame.draw.lines(surface, color, True, points, width) for (color, points, width) in self.__debug_entries]
+
+    def clear(self):
+        self.__blit_entries.clear()
+        self.__debug_entries.clear()
+        if self.__dirty_rects is not None:
+            self.__dirty_rects.clear()
+
+    def __len__(self):
+        return len(self.__blit_entries)
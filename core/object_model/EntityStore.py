@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import typing
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if typing.TYPE_CHECKING:
+    from core.object_model.Atlas import Atlas
+
+
+class EntityStore:
+    """
+    Struct-of-arrays storage for the kinematic state of a population of atlases.
+
+    Position, speed, acceleration, scale and opacity of every bound atlas live in contiguous NumPy arrays, one row
+    per atlas. The atlas properties keep working as views onto that row, while `integrate` advances the whole
+    population in one vectorized step. Rows are kept dense: removing an atlas moves the last row into its place.
+
+    NumPy is optional; `create` returns None when it is not installed, and atlases then keep their own state.
+    """
+    AVAILABLE = numpy is not None
+    INITIAL_CAPACITY = 64
+
+    @classmethod
+    def create(cls, capacity: int = INITIAL_CAPACITY) -> typing.Optional[EntityStore]:
+        return cls(capacity) if cls.AVAILABLE else None
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        if numpy is None:
+            raise RuntimeError("EntityStore requires NumPy")
+
+        self.__atlases: typing.List[Atlas] = []
+        self.__positions = numpy.zeros((capacity, 2))
+        self.__previous_positions = numpy.zeros((capacity, 2))
+        self.__speeds = numpy.zeros((capacity, 2))
+        self.__accelerations = numpy.zeros((capacity, 2))
+        self.__scales = numpy.ones((capacity, 2))
+        self.__opacities = numpy.full(capacity, 255, dtype=numpy.int32)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.__positions)
+
+    @property
+    def atlases(self) -> typing.List[Atlas]:
+        return self.__atlases
+
+    @property
+    def positions(self):
+        return self.__positions[:len(self.__atlases)]
+
+    @property
+    def speeds(self):
+        return self.__speeds[:len(self.__atlases)]
+
+    @property
+    def accelerations(self):
+        return self.__accelerations[:len(self.__atlases)]
+
+    def bind(self, atlas: Atlas):
+        if atlas.entity_store is self:
+            return
+        if atlas.entity_store is not None:
+            atlas.entity_store.unbind(atlas)
+
+        row = len(self.__atlases)
+        if row == self.capacity:
+            self.grow(2 * self.capacity)
+
+        self.__positions[row] = atlas.position
+        self.__previous_positions[row] = atlas.previous_position
+        self.__speeds[row] = atlas.speed
+        self.__accelerations[row] = atlas.acceleration
+        self.__scales[row] = atlas.scale
+        self.__opacities[row] = atlas.opacity
+        self.__atlases.append(atlas)
+        self.bind_row(row)
+
+    def unbind(self, atlas: Atlas):
+        if atlas.entity_store is not self:
+            return
+
+        row = atlas.entity_row
+        last_row = len(self.__atlases) - 1
+        # The atlas takes a copy of its state with it
+        atlas.unbind_entity_store()
+        if row != last_row:
+            for array in (self.__positions, self.__previous_positions, self.__speeds, self.__accelerations,
+                          self.__scales, self.__opacities):
+                array[row] = array[last_row]
+            self.__atlases[row] = self.__atlases[last_row]
+            self.bind_row(row)
+        self.__atlases.pop()
+
+    def bind_row(self, row: int):
+        self.__atlases[row].bind_entity_store(
+            self, row,
+            self.__positions[row],
+            self.__previous_positions[row],
+            self.__speeds[row],
+            self.__accelerations[row],
+            self.__scales[row],
+            self.__opacities[row:row + 1]
+        )
+
+    def grow(self, capacity: int):
+        count = len(self.__atlases)
+
+        def resized(array, fill_value):
+            grown = numpy.full((capacity, *array.shape[1:]), fill_value, dtype=array.dtype)
+            grown[:count] = array[:count]
+            return grown
+
+        self.__positions = resized(self.__positions, 0)
+        self.__previous_positions = resized(self.__previous_positions, 0)
+        self.__speeds = resized(self.__speeds, 0)
+        self.__accelerations = resized(self.__accelerations, 0)
+        self.__scales = resized(self.__scales, 1)
+        self.__opacities = resized(self.__opacities, 255)
+        # Views onto the old arrays are stale now
+        [self.bind_row(row) for row in range(count)]
+
+    def sync(self, atlases: typing.Iterable[Atlas]):
+        """
+        Make the bound population match `atlases`, for owners that add and remove atlases on a plain list.
+        """
+        # Atlases hash by identity, so the common no-change case stays in C
+        members = set(atlases)
+        bound = set(self.__atlases)
+        if members == bound:
+            return
+        [self.unbind(atlas) for atlas in bound - members]
+        [self.bind(atlas) for atlas in atlases if atlas.entity_store is not self]
+
+    def snapshot(self):
+        count = len(self.__atlases)
+        self.__previous_positions[:count] = self.__positions[:count]
+
+    def integrate(self):
+        count = len(self.__atlases)
+        self.__speeds[:count] += self.__accelerations[:count]
+        self.__positions[:count] += self.__speeds[:count]
+
+    def clear(self):
+        [atlas.unbind_entity_store() for atlas in self.__atlases]
+        self.__atlases.clear()
+
+    def __len__(self):
+        return len(self.__atlases)
+
+    def __repr__(self):
+        return f"EntityStore(entities={len(self.__atlases)}, capacity={self.capacity})"
@@ -5,28 +5,135 @@ from typing import List
 import pygame.sprite
 
 from core.object_model.Atlas import Atlas
+from core.object_model.DrawList import DrawList
+from core.object_model.EntityStore import EntityStore
+from util.FrameProfiler import FrameProfiler
 
 
 class Layer:
-    def __init__(self, *args: Atlas):
+    def __init__(self, *args: Atlas, entity_store: typing.Optional[EntityStore] = None):
         self.__atlases: typing.List[Atlas] = [*args]
+        self.__draw_list = DrawList()
+        self.__entity_store = entity_store
+        # Atlases despawned during the frame; they are dropped from the list in one pass by `compact`
+        self.__dead_atlases: typing.Set[Atlas] = set()
+        self.__despawn_count = 0
+        # Areas last drawn by atlases that left the layer, reported as dirty by the next `collect`
+        self.__vacated_rects: typing.List[pygame.Rect] = []
+        self.__profiler = FrameProfiler()
+        # Named after the key the layer is stored under once it is added to a `LayerManager`
+        self.__scope_names = ("layer.collect", "layer.submit")
+
+    @property
+    def entity_store(self) -> typing.Optional[EntityStore]:
+        return self.__entity_store
+
+    @property
+    def atlases(self) -> typing.List[Atlas]:
+        return self.__atlases
 
     def set_atlas_list(self, val: List[Atlas]):
+        kept_atlas_ids = set(map(id, val))
+        self.vacate(atlas for atlas in self.__atlases if id(atlas) not in kept_atlas_ids)
         self.__atlases = val
 
     def del_atlas(self, atlas: Atlas):
         self.__atlases.remove(atlas)
+        self.vacate((atlas,))
+
+    def vacate(self, atlases: typing.Iterable[Atlas]):
+        for atlas in atlases:
+            rect = atlas.forget_drawn_rect()
+            if rect is not None:
+                self.__vacated_rects.append(rect)
+
+    def set_profile_key(self, key: str):
+        self.__scope_names = (f"layer.{key}.collect", f"layer.{key}.submit")
+
+    def release_surface_caches(self):
+        [atlas.release_surface_cache() for atlas in self.__atlases]
+
+    def detach(self) -> typing.List[pygame.Rect]:
+        # Called when the layer is removed; returns the areas its atlases leave behind
+        self.vacate(self.__atlases)
+        vacated_rects = self.__vacated_rects
+        self.__vacated_rects = []
+        return vacated_rects
 
     def add_atlas(self, atlas: Atlas):
         self.__atlases.append(atlas)
 
+    @property
+    def despawn_count(self) -> int:
+        return self.__despawn_count
+
+    def despawn(self, atlas: Atlas):
+        self.__dead_atlases.add(atlas)
+
+    def is_alive(self, atlas: Atlas) -> bool:
+        return atlas not in self.__dead_atlases
+
+    def alive_atlases(self) -> typing.Iterator[Atlas]:
+        return (atlas for atlas in self.__atlases if atlas not in self.__dead_atlases)
+
+    def compact(self):
+        if not len(self.__dead_atlases):
+            return
+
+        # In place, as owners may share the list with the layer
+        self.__atlases[:] = [atlas for atlas in self.__atlases if atlas not in self.__dead_atlases]
+        self.vacate(self.__dead_atlases)
+        for atlas in self.__dead_atlases:
+            if self.__entity_store is not None:
+                self.__entity_store.unbind(atlas)
+            atlas.on_despawn()
+        self.__despawn_count += len(self.__dead_atlases)
+        self.__dead_atlases.clear()
+
+    def snapshot(self):
+        if self.__entity_store is None:
+            [atlas.snapshot() for atlas in self.__atlases]
+            return
+
+        self.__entity_store.snapshot()
+        if len(self.__entity_store) != len(self.__atlases):
+            # Atlases added since the last sync take their own snapshot into the store when bound
+            [atlas.snapshot() for atlas in self.__atlases if atlas.entity_store is not self.__entity_store]
+
     def update(self):
-        for atlas in self.__atlases:
-            atlas.update()
+        if self.__entity_store is None:
+            for atlas in self.__atlases:
+                atlas.update()
+            return
 
-    def render(self, surface: pygame.surface.Surface):
-        for atlas in self.__atlases:
-            atlas.render(surface)
+        # Atlases may be added to or removed from the list directly, so the store follows it every frame
+        self.__entity_store.sync(self.__atlases)
+        self.__entity_store.integrate()
+        # Only atlases with logic beyond kinematics still need their own update call
+        custom_types = {atlas_type for atlas_type in set(map(type, self.__atlases))
+                        if atlas_type.update is not Atlas.update}
+        if len(custom_types):
+            [atlas.update() for atlas in self.__atlases if type(atlas) in custom_types]
+
+    def collect(self, draw_list: DrawList, view_rect: typing.Optional[pygame.Rect] = None):
+        if len(self.__vacated_rects):
+            if draw_list.dirty_rects is not None:
+                draw_list.dirty_rects.extend(self.__vacated_rects)
+            self.__vacated_rects.clear()
+        [atlas.collect(draw_list, view_rect) for atlas in self.__atlases]
+
+    def render(self, surface: pygame.surface.Surface, view_rect: typing.Optional[pygame.Rect] = None,
+               interpolation: float = 1.0):
+        if view_rect is None:
+            view_rect = surface.get_rect()
+
+        # All atlases of the layer are collected first, then submitted in one batch
+        self.__draw_list.clear()
+        self.__draw_list.interpolation = interpolation
+        with self.__profiler.scope(self.__scope_names[0]):
+            self.collect(self.__draw_list, view_rect)
+        with self.__profiler.scope(self.__scope_names[1]):
+            self.__draw_list.submit(surface)
 
     def accept_event(self, event: pygame.event.Event):
         for atlas in self.__atlases:
@@ -5,28 +5,63 @@ import typing
 
 import pygame.surface
 
+from core.object_model.DrawList import DrawList
 from core.object_model.Layer import Layer
+from util.FrameProfiler import FrameProfiler
 
 
 class LayerManager:
     def __init__(self):
         self.__layer_dict: typing.Dict[str, Layer] = {}
+        self.__profiler = FrameProfiler()
+        # Scope names are built once per layer rather than on every frame
+        self.__scope_names: typing.Dict[str, typing.Tuple[str, str]] = {}
+        # Areas left behind by removed layers, reported as dirty by the next `collect`
+        self.__vacated_rects: typing.List[pygame.Rect] = []
 
     def update(self):
-        for layer in self.__layer_dict.values():
-            layer.update()
+        for (key, layer) in self.__layer_dict.items():
+            with self.__profiler.scope(self.__scope_names[key][0]):
+                layer.update()
+
+    def snapshot(self):
+        [layer.snapshot() for layer in self.__layer_dict.values()]
+
+    def compact(self):
+        [layer.compact() for layer in self.__layer_dict.values()]
+
+    @property
+    def despawn_count(self) -> int:
+        return sum(layer.despawn_count for layer in self.__layer_dict.values())
+
+    def release_surface_caches(self):
+        [layer.release_surface_caches() for layer in self.__layer_dict.values()]
 
     def accept_event(self, event: pygame.event.Event):
         if event.type == pygame.KEYDOWN \
                 or event.type == pygame.KEYUP:
             [layer.accept_event(event) for layer in self.__layer_dict.values()]
 
-    def render(self, surface: pygame.surface.Surface):
-        for layer in self.__layer_dict.values():
-            layer.render(surface)
+    def collect(self, draw_list: DrawList, view_rect: typing.Optional[pygame.Rect] = None):
+        if len(self.__vacated_rects):
+            if draw_list.dirty_rects is not None:
+                draw_list.dirty_rects.extend(self.__vacated_rects)
+            self.__vacated_rects.clear()
+        [layer.collect(draw_list, view_rect) for layer in self.__layer_dict.values()]
+
+    def render(self, surface: pygame.surface.Surface, view_rect: typing.Optional[pygame.Rect] = None,
+               interpolation: float = 1.0):
+        for (key, layer) in self.__layer_dict.items():
+            with self.__profiler.scope(self.__scope_names[key][1]):
+                layer.render(surface, view_rect, interpolation)
 
     def __setitem__(self, key: str, item: typing.Any):
+        replaced_layer = self.__layer_dict.get(key)
+        if replaced_layer is not None and replaced_layer is not item:
+            self.__vacated_rects.extend(replaced_layer.detach())
         self.__layer_dict[key] = item
+        self.__scope_names[key] = (f"layer.{key}.update", f"layer.{key}.render")
+        item.set_profile_key(key)
 
     def __getitem__(self, key: str):
         item = self.__layer_dict[key]
@@ -42,7 +77,8 @@ class LayerManager:
         return len(self.__layer_dict)
 
     def __delitem__(self, key: str):
-        del self.__layer_dict[key]
+        self.__vacated_rects.extend(self.__layer_dict.pop(key).detach())
+        del self.__scope_names[key]
 
     def __cmp__(self, other: LayerManager):
         return self.__cmp__(other)
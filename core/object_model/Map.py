@@ -20,31 +20,35 @@ class Map:
         DEAD = 3
         START = 4
 
-    def __init__(self, map_file: typing.Optional[str], *args, **kwargs):
+    def __init__(self, map_file: typing.Optional[typing.Union[str, typing.TextIO]], *args, **kwargs):
         self.__tile_count: typing.List[int] = [0, 0]
         self.__tile_types: typing.List[typing.List[int]] = [[]]
         self.__start_point: typing.Tuple[int, int] = (0, 0)
         self.__exit_point: typing.Tuple[int, int] = (0, 0)
 
         if map_file is None:
-            self.random(kwargs["tile_count"])
+            self.random(kwargs["tile_count"], kwargs.get("rng"))
             return
 
-        with open(map_file, "r") as f:
-            lines = f.read().split('\n')
-            self.__tile_types = [
-                [Map.TileType(int(type_id)) for type_id in line.strip(',').split(',')]
-                for line in lines if line
-            ]
-            self.__tile_count[0] = len(self.__tile_types)
-            self.__tile_count[1] = len(self.__tile_types[0])
-
-            for i in range(self.__tile_count[0]):
-                for j in range(self.__tile_count[1]):
-                    if self.__tile_types[i][j] == Map.TileType.START:
-                        self.__start_point = (i, j)
-                    if self.__tile_types[i][j] == Map.TileType.EXIT:
-                        self.__exit_point = (i, j)
+        if isinstance(map_file, str):
+            with open(map_file, "r") as f:
+                lines = f.read().split('\n')
+        else:
+            lines = map_file.read().split('\n')
+
+        self.__tile_types = [
+            [Map.TileType(int(type_id)) for type_id in line.strip(',').split(',')]
+            for line in lines if line
+        ]
+        self.__tile_count[0] = len(self.__tile_types)
+        self.__tile_count[1] = len(self.__tile_types[0])
+
+        for i in range(self.__tile_count[0]):
+            for j in range(self.__tile_count[1]):
+                if self.__tile_types[i][j] == Map.TileType.START:
+                    self.__start_point = (i, j)
+                if self.__tile_types[i][j] == Map.TileType.EXIT:
+                    self.__exit_point = (i, j)
 
     @property
     def tile_count(self) -> typing.Tuple[int, int]:
@@ -62,17 +66,18 @@ class Map:
     def exit_point(self):
         return self.__exit_point
 
-    def random(self, tile_count: typing.Tuple[int, int]):
+    def random(self, tile_count: typing.Tuple[int, int], rng: typing.Optional[random.Random] = None):
+        # Without a generator of its own, the map draws from the shared one, which recorded sessions seed
         self.__tile_count = list(tile_count)
-        self.bsp_random()
+        self.bsp_random(rng)
         self.set_wall()
-        self.set_terminals()
+        self.set_terminals(rng)
         self.make_paths()
 
-    def bsp_random(self):
+    def bsp_random(self, rng: typing.Optional[random.Random] = None):
         bsp_tree = BSPTree(pygame.Rect((0, 0), (self.__tile_count[1], self.__tile_count[0])))
-        bsp_tree.random()
-        bsp_tree.generate_rooms()
+        bsp_tree.random(rng=rng)
+        bsp_tree.generate_rooms(rng=rng)
         self.__tile_types = bsp_tree.to_map_tiles()
 
     def set_wall(self):
@@ -84,7 +89,8 @@ class Map:
         for (i, j) in candidates:
             self.__tile_types[i][j] = Map.TileType.WALL
 
-    def set_terminals(self):
+    def set_terminals(self, rng: typing.Optional[random.Random] = None):
+        rng = rng if rng is not None else random
         (height, width) = (self.__tile_count[0], self.__tile_count[1])
 
         # Set starting point
@@ -100,7 +106,7 @@ class Map:
 
         while True:
             # No blocker before the exit tile
-            (i, j) = random.choice(list(candidates))
+            (i, j) = rng.choice(list(candidates))
             if i == 0 and self.__tile_types[i + 1][j] == Map.TileType.WALL \
                     or j == 0 and self.__tile_types[i][j + 1] == Map.TileType.WALL \
                     or (height - i - 1) == 0 and self.__tile_types[i - 1][j] == Map.TileType.WALL \
@@ -1,15 +1,30 @@
 # -*- coding: utf-8 -*-
 import typing
 
+import pygame.event
 import pygame.mixer
 
 from core.object_model.Atlas import Atlas
+from core.object_model.DrawList import DrawList
 from core.object_model.LayerManager import LayerManager
 from core.object_model.Sound import Sound
 from core.object_model.Sprite import Sprite
+from core.object_model.TextureSheet import TextureSheetPacker
+from event.CustomEventTypes import CustomEventTypes
 
 
 class Scene:
+    # Asset keys the scene loads on construction, so that they can be decoded ahead of time
+    MANIFEST: typing.Tuple[str, ...] = ()
+    # Scenes that hardly change between frames only redraw, and have presented, the areas their atlases changed
+    DIRTY_RECT_RENDERING = False
+
+    @classmethod
+    def request_preload(cls):
+        event = pygame.event.Event(CustomEventTypes.EVENT_ASSET_PRELOAD_REQUEST)
+        event.manifest = cls.MANIFEST
+        pygame.event.post(event)
+
     def __init__(self, size: typing.Tuple[int, int]):
         self.__size = size
 
@@ -25,6 +40,9 @@ class Scene:
         self.__sound_fx_dict: typing.Dict[str, Sound] = {}
         self.__background_music_channel: pygame.mixer.Channel = pygame.mixer.Channel(0)
 
+        self.__draw_list = DrawList(track_dirty_rects=True)
+        self.__needs_full_redraw = True
+
     @property
     def size(self):
         return self.__size
@@ -57,12 +75,56 @@ class Scene:
     def background_music(self, value: Sound):
         self.__background_music = value
 
+    def pack_textures(self) -> int:
+        return TextureSheetPacker().pack_atlases(
+            [atlas for layer in self.__layer_manager.values() for atlas in layer.atlases]
+        )
+
+    def snapshot(self):
+        # Called before every simulation step, so that rendering can interpolate from the previous step
+        self.__layer_manager.snapshot()
+
     def update(self):
         self.__layer_manager.update()
-
-    def render(self, surface: pygame.surface.Surface):
-        self.__background.render(surface)
-        self.__layer_manager.render(surface)
+        self.__layer_manager.compact()
+
+    def teardown(self):
+        # Called when the scene is replaced, so that the surfaces it shared go back to the cache right away
+        self.__background.release_surface_cache()
+        self.__layer_manager.release_surface_caches()
+
+    def invalidate(self):
+        # The next frame is drawn and presented whole, e.g. after the window contents were lost
+        self.__needs_full_redraw = True
+
+    def render(self, surface: pygame.surface.Surface,
+               interpolation: float = 1.0) -> typing.Optional[typing.List[pygame.Rect]]:
+        """
+        Draws the scene, and returns the areas of the surface that changed, or None when all of it may have.
+        """
+        if not self.DIRTY_RECT_RENDERING:
+            self.__background.render(surface)
+            self.__layer_manager.render(surface, None, interpolation)
+            return None
+
+        draw_list = self.__draw_list
+        draw_list.clear()
+        draw_list.interpolation = interpolation
+        self.__background.collect(draw_list)
+        self.__layer_manager.collect(draw_list)
+
+        if self.__needs_full_redraw:
+            self.__needs_full_redraw = False
+            draw_list.submit(surface)
+            return [surface.get_rect()]
+
+        dirty_rects = draw_list.dirty_rects
+        # Everything overlapping a dirty area is drawn again, clipped to it
+        for dirty_rect in dirty_rects:
+            surface.set_clip(dirty_rect)
+            draw_list.submit(surface)
+        surface.set_clip(None)
+        return list(dirty_rects)
 
     def accept_event(self, event: pygame.event.Event):
         self.layer_manager.accept_event(event)
@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
-import pygame.sprite
+import pygame.surface
 
 
-class Sprite(pygame.sprite.Sprite):
-    def __init__(self, image: pygame.surface.Surface, *args, **kwargs):
-        super().__init__()
-        self.image = image.convert_alpha()
+class Sprite:
+    __slots__ = ("image", "rect")
+
+    def __init__(self, image: pygame.surface.Surface, *args, convert: bool = True, **kwargs):
+        self.image = image.convert_alpha() if convert else image
         self.rect = self.image.get_rect()
 
     @property
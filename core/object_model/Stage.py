@@ -13,6 +13,10 @@ class Stage:
         self.__before_scene_change: typing.Callable[[None], None] = lambda: None
         self.__after_scene_change: typing.Callable[[None], None] = lambda: None
 
+    @property
+    def surface(self):
+        return self.__surface
+
     @property
     def before_scene_change(self):
         return self.__before_scene_change
@@ -36,6 +40,12 @@ class Stage:
     @scene.setter
     def scene(self, value: Scene):
         self.__before_scene_change()
+        if self.__scene is not None and self.__scene is not value:
+            self.__scene.teardown()
+        # The sprites the scene starts with are copied into shared sheets, so that layers draw from few surfaces
+        value.pack_textures()
+        # Nothing has moved yet, so the first frames are not interpolated from stale positions
+        value.snapshot()
         self.__scene = value
         self.__after_scene_change()
 
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import typing
+
+import pygame
+
+from util.LRUCache import LRUCache
+
+SurfaceCacheKeyType: typing.TypeAlias = typing.Tuple[int, typing.Tuple[int, int], bool, int]
+
+
+class SurfaceCacheEntry:
+    def __init__(self, key: SurfaceCacheKeyType, source: pygame.surface.Surface, surface: pygame.surface.Surface):
+        self.__key = key
+        # Keeps the source alive so that its id cannot be reused by another surface while the entry exists
+        self.__source = source
+        self.__surface = surface
+        # Built on first use, as most entries are only ever drawn
+        self.__mask: typing.Optional[pygame.mask.Mask] = None
+        # Debug collision outline, likewise built on first use
+        self.__outline: typing.Optional[typing.List[typing.Tuple[int, int]]] = None
+        self.__reference_count = 0
+        # Set once the surface has been copied into a texture sheet
+        self.__sheet: typing.Optional[pygame.surface.Surface] = None
+        self.__area: typing.Optional[pygame.Rect] = None
+
+    @property
+    def key(self) -> SurfaceCacheKeyType:
+        return self.__key
+
+    @property
+    def surface(self) -> pygame.surface.Surface:
+        return self.__surface
+
+    @property
+    def rect_mask(self) -> bool:
+        return self.__key[2]
+
+    @property
+    def mask(self) -> pygame.mask.Mask:
+        if self.__mask is None:
+            if self.rect_mask:
+                self.__mask = pygame.mask.from_surface(self.__surface)
+            else:
+                self.__mask = pygame.mask.Mask(self.__surface.get_size(), True)
+        return self.__mask
+
+    @property
+    def outline(self) -> typing.List[typing.Tuple[int, int]]:
+        if self.__outline is None:
+            self.__outline = self.mask.outline()
+        return self.__outline
+
+    @property
+    def sheet(self) -> pygame.surface.Surface:
+        return self.__sheet if self.__sheet is not None else self.__surface
+
+    @property
+    def area(self) -> typing.Optional[pygame.Rect]:
+        return self.__area
+
+    def pack(self, sheet: pygame.surface.Surface, area: pygame.Rect):
+        self.__sheet = sheet
+        self.__area = area
+        # The standalone copy is dropped in favour of a view into the sheet
+        self.__surface = sheet.subsurface(area)
+
+    @property
+    def reference_count(self) -> int:
+        return self.__reference_count
+
+    @reference_count.setter
+    def reference_count(self, value: int):
+        self.__reference_count = value
+
+    @property
+    def byte_size(self) -> int:
+        return self.__surface.get_bytesize() * self.__surface.get_width() * self.__surface.get_height()
+
+
+class SurfaceCache:
+    """
+    Process-wide flyweight store of scaled sprite surfaces and their collision masks.
+
+    Atlases showing the same source surface at the same size, mask mode and opacity share one read-only entry.
+    Entries are reference counted; unreferenced entries are kept in an idle LRU pool bounded by `IDLE_BUDGET`
+    bytes so that respawning an entity does not rebuild them.
+    """
+    IDLE_BUDGET = 32 * 1024 * 1024
+
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        def init(instance):
+            instance.__entries: typing.Dict[SurfaceCacheKeyType, SurfaceCacheEntry] = {}
+            instance.__idle_entries = LRUCache(
+                SurfaceCache.IDLE_BUDGET,
+                lambda entry: entry.byte_size,
+                lambda key, _: instance.__entries.pop(key, None)
+            )
+            instance.__hits = 0
+            instance.__misses = 0
+
+        if cls.__instance is None:
+            cls.__instance = super(SurfaceCache, cls).__new__(cls)
+            init(cls.__instance)
+
+        return cls.__instance
+
+    @property
+    def idle_budget(self) -> int:
+        return self.__idle_entries.budget
+
+    @idle_budget.setter
+    def idle_budget(self, value: int):
+        self.__idle_entries.budget = value
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    @property
+    def evictions(self) -> int:
+        return self.__idle_entries.evictions
+
+    @property
+    def live_count(self) -> int:
+        return len(self.__entries) - len(self.__idle_entries)
+
+    @property
+    def idle_count(self) -> int:
+        return len(self.__idle_entries)
+
+    def acquire(self, source: pygame.surface.Surface, size: typing.Tuple[int, int], rect_mask: bool,
+                opacity: int) -> SurfaceCacheEntry:
+        key = (id(source), size, rect_mask, opacity)
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.__misses += 1
+            entry = self.build_entry(key, source, size, rect_mask, opacity)
+            self.__entries[key] = entry
+        else:
+            self.__hits += 1
+            if entry.reference_count == 0:
+                self.__idle_entries.pop(key)
+
+        entry.reference_count += 1
+        return entry
+
+    def release(self, entry: SurfaceCacheEntry):
+        entry.reference_count -= 1
+        if entry.reference_count == 0:
+            self.__idle_entries.put(entry.key, entry)
+
+    @staticmethod
+    def build_entry(key: SurfaceCacheKeyType, source: pygame.surface.Surface, size: typing.Tuple[int, int],
+                    rect_mask: bool, opacity: int) -> SurfaceCacheEntry:
+        surface = pygame.transform.scale(source, size)
+        surface.set_alpha(opacity)
+        return SurfaceCacheEntry(key, source, surface)
+
+    def clear_idle(self):
+        for key in list(self.__idle_entries):
+            self.__entries.pop(key, None)
+        self.__idle_entries.clear()
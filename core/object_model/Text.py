@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import json
+import typing
 
 import pygame
 
@@ -8,8 +9,12 @@ from util import util
 
 
 class Text(Sprite):
-    def __init__(self, definition_file_path: str, *args, **kwargs):
-        definition = json.load(open(definition_file_path))
+    def __init__(self, definition_file: typing.Union[str, typing.TextIO], *args, **kwargs):
+        if isinstance(definition_file, str):
+            with open(definition_file) as f:
+                definition = json.load(f)
+        else:
+            definition = json.load(definition_file)
         self.__wrap = definition["wrap"]
         self.__font = definition["font"]
         self.__font_size = definition["fontSize"]
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import typing
+
+import pygame
+
+from core.object_model.SurfaceCache import SurfaceCacheEntry
+
+if typing.TYPE_CHECKING:
+    from core.object_model.Atlas import Atlas
+
+
+class TextureSheet:
+    """
+    A sheet that small surfaces are copied into, so that they can be drawn as sub-rects of one surface.
+
+    Space is handed out by a shelf allocator: rows of the height of their tallest surface, filled left to right.
+    The backing surface is only created by `build`, with the extent actually used.
+    """
+
+    def __init__(self, max_size: typing.Tuple[int, int]):
+        self.__max_size = max_size
+        # [y, height, next free x] of every shelf
+        self.__shelves: typing.List[typing.List[int]] = []
+        self.__used_width = 0
+        self.__used_height = 0
+        self.__placements: typing.List[typing.Tuple[pygame.surface.Surface, pygame.Rect]] = []
+        self.__surface: typing.Optional[pygame.surface.Surface] = None
+
+    @property
+    def surface(self) -> typing.Optional[pygame.surface.Surface]:
+        return self.__surface
+
+    @property
+    def used_width(self) -> int:
+        return self.__used_width
+
+    @property
+    def used_height(self) -> int:
+        return self.__used_height
+
+    def allocate(self, surface: pygame.surface.Surface) -> typing.Optional[pygame.Rect]:
+        (width, height) = surface.get_size()
+        (max_width, max_height) = self.__max_size
+        if self.__surface is not None or width > max_width or height > max_height:
+            return None
+
+        shelf = next((shelf for shelf in self.__shelves
+                      if height <= shelf[1] and shelf[2] + width <= max_width), None)
+        if shelf is None:
+            if self.__used_height + height > max_height:
+                return None
+            shelf = [self.__used_height, height, 0]
+            self.__shelves.append(shelf)
+            self.__used_height += height
+
+        area = pygame.Rect(shelf[2], shelf[0], width, height)
+        shelf[2] += width
+        self.__used_width = max(self.__used_width, shelf[2])
+        self.__placements.append((surface, area))
+        return area
+
+    def build(self) -> pygame.surface.Surface:
+        self.__surface = pygame.Surface((max(self.__used_width, 1), max(self.__used_height, 1)),
+                                        pygame.SRCALPHA, 32)
+        self.__surface = self.__surface.convert_alpha()
+        # The sheet is fully transparent, so taking the maximum copies the pixels without blending them
+        [self.__surface.blit(surface, area, special_flags=pygame.BLEND_RGBA_MAX)
+         for (surface, area) in self.__placements]
+        self.__placements.clear()
+        return self.__surface
+
+
+class TextureSheetPacker:
+    SHEET_SIZE = (2048, 2048)
+
+    def __init__(self, sheet_size: typing.Tuple[int, int] = SHEET_SIZE):
+        self.__sheet_size = sheet_size
+        self.__sheets: typing.List[TextureSheet] = []
+
+    @property
+    def sheets(self) -> typing.List[TextureSheet]:
+        return self.__sheets
+
+    def pack(self, entries: typing.Iterable[SurfaceCacheEntry]) -> int:
+        # Entries drawn translucent keep their own surface, as the sheet carries no per-region alpha
+        candidates = {id(entry): entry for entry in entries
+                      if entry.area is None and entry.surface.get_alpha() in (None, 255)}
+        # Tallest first, so that shelves are filled evenly
+        candidates = sorted(candidates.values(), key=lambda entry: entry.surface.get_height(), reverse=True)
+
+        sheets: typing.List[TextureSheet] = []
+        placements: typing.List[typing.Tuple[SurfaceCacheEntry, TextureSheet, pygame.Rect]] = []
+        for entry in candidates:
+            placement = None
+            for sheet in sheets:
+                area = sheet.allocate(entry.surface)
+                if area is not None:
+                    placement = (entry, sheet, area)
+                    break
+
+            if placement is None:
+                sheet = TextureSheet(self.__sheet_size)
+                area = sheet.allocate(entry.surface)
+                if area is None:
+                    # Larger than a whole sheet
+                    continue
+                sheets.append(sheet)
+                placement = (entry, sheet, area)
+
+            placements.append(placement)
+
+        [sheet.build() for sheet in sheets]
+        [entry.pack(sheet.surface, area) for (entry, sheet, area) in placements]
+        self.__sheets.extend(sheets)
+        return len(placements)
+
+    def pack_atlases(self, atlases: typing.Iterable[Atlas]) -> int:
+        return self.pack([entry for atlas in atlases for entry in atlas.surface_cache_entries])
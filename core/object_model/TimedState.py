@@ -1,4 +1,6 @@
 class TimedState:
+    __slots__ = ("__frame_counter", "__frame_limit", "activate", "pause")
+
     def __init__(self, frame_limit: int):
         self.__frame_counter = 0
         self.__frame_limit = frame_limit
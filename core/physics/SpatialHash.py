@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import typing
+
+import pygame
+
+from core.object_model.Atlas import Atlas
+from core.object_model.Layer import Layer
+
+CellType: typing.TypeAlias = typing.Tuple[int, int]
+CollisionType: typing.TypeAlias = typing.Tuple[Atlas, typing.Tuple[int, int]]
+CollisionPairType: typing.TypeAlias = typing.Tuple[Atlas, Atlas, typing.Tuple[int, int]]
+
+
+class SpatialHash:
+    """
+    Uniform-grid broadphase for atlas-vs-atlas collision.
+
+    Scenes refill it from their layers once per frame, then ask for the atlases whose rectangles overlap a query
+    rectangle. Only those candidates are passed to the (more expensive) mask overlap test.
+    """
+
+    def __init__(self, cell_size: int = 128):
+        self.__cell_size = cell_size
+        self.__cells: typing.Dict[CellType, typing.List[typing.Tuple[Atlas, pygame.Rect]]] = {}
+        self.__atlas_count = 0
+
+    @property
+    def cell_size(self) -> int:
+        return self.__cell_size
+
+    def clear(self):
+        self.__cells.clear()
+        self.__atlas_count = 0
+
+    def insert(self, *atlases: Atlas):
+        for atlas in atlases:
+            if atlas.current_sprite_key is None or not atlas.COLLIDABLE:
+                continue
+            rect = atlas.rect
+            for cell in self.cells_of(rect):
+                self.__cells.setdefault(cell, []).append((atlas, rect))
+            self.__atlas_count += 1
+
+    def insert_layer(self, *layers: Layer):
+        for layer in layers:
+            self.insert(*layer.atlases)
+
+    def cells_of(self, rect: pygame.Rect) -> typing.Iterator[CellType]:
+        first_x = rect.left // self.__cell_size
+        first_y = rect.top // self.__cell_size
+        last_x = (rect.right - 1) // self.__cell_size
+        last_y = (rect.bottom - 1) // self.__cell_size
+        return ((x, y) for x in range(first_x, last_x + 1) for y in range(first_y, last_y + 1))
+
+    def query(self, rect: pygame.Rect) -> typing.List[Atlas]:
+        # An atlas spanning several cells is reported once
+        visited: typing.Set[int] = set()
+        candidates: typing.List[Atlas] = []
+        for cell in self.cells_of(rect):
+            for atlas, atlas_rect in self.__cells.get(cell, ()):
+                if id(atlas) in visited or not rect.colliderect(atlas_rect):
+                    continue
+                visited.add(id(atlas))
+                candidates.append(atlas)
+        return candidates
+
+    def candidate_pairs(self, atlases: typing.Iterable[Atlas]) -> typing.Iterator[typing.Tuple[Atlas, Atlas]]:
+        for atlas in atlases:
+            if atlas.current_sprite_key is None:
+                continue
+            for other in self.query(atlas.rect):
+                if other is not atlas:
+                    yield atlas, other
+
+    def collisions(self, atlas: Atlas) -> typing.Iterator[CollisionType]:
+        for _, other, point in self.collision_pairs((atlas,)):
+            yield other, point
+
+    def collision_pairs(self, atlases: typing.Iterable[Atlas]) -> typing.Iterator[CollisionPairType]:
+        for atlas, other in self.candidate_pairs(atlases):
+            point = atlas.collides_atlas(other)
+            if point:
+                yield atlas, other, point
+
+    def __len__(self):
+        return self.__atlas_count
+
+    def __repr__(self):
+        return f"SpatialHash(cell_size={self.__cell_size}, atlases={self.__atlas_count}, cells={len(self.__cells)})"
@@ -3,41 +3,32 @@ from __future__ import annotations
 
 import typing
 
+if typing.TYPE_CHECKING:
+    from core.state_machine.StateContext import StateContext
+
 
 class State:
-    def __init__(self, identifier: str, **kwargs):
+    """
+    Behaviour of a state, shared by every state machine built from the same template.
+
+    Hooks get the `StateContext` of the machine they run for, which holds everything that differs per instance.
+    """
+    __slots__ = ("__identifier",)
+
+    def __init__(self, identifier: str):
         self.__identifier = identifier
-        self.__persistent_store: typing.Dict = kwargs
-        self.__store: typing.Dict = {}
-        self.__volatile_store: typing.Dict = {}
 
     @property
     def identifier(self):
         return self.__identifier
 
-    @property
-    def persistent_store(self):
-        return self.__persistent_store
-
-    @property
-    def store(self):
-        return self.__store
-
-    @property
-    def volatile_store(self):
-        return self.__volatile_store
-
-    def reset(self):
-        self.__volatile_store.clear()
-        self.__store.clear()
-
-    def before_entry(self):
+    def before_entry(self, context: StateContext):
         pass
 
-    def before_leave(self):
+    def before_leave(self, context: StateContext):
         pass
 
-    def update(self):
+    def update(self, context: StateContext):
         pass
 
     def __hash__(self):
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+import typing
+
+
+class StateContext:
+    """
+    Per-instance data of one state in one state machine.
+
+    `persistent_store` is shared by all states of the machine and lives as long as it does; `store` is kept until the
+    machine is reset, and `volatile_store` is cleared every time the state is entered or left.
+    """
+    __slots__ = ("__persistent_store", "__store", "__volatile_store")
+
+    def __init__(self, persistent_store: typing.Dict):
+        self.__persistent_store = persistent_store
+        self.__store: typing.Dict = {}
+        self.__volatile_store: typing.Dict = {}
+
+    @property
+    def persistent_store(self) -> typing.Dict:
+        return self.__persistent_store
+
+    @property
+    def store(self) -> typing.Dict:
+        return self.__store
+
+    @property
+    def volatile_store(self) -> typing.Dict:
+        return self.__volatile_store
+
+    def reset(self):
+        self.__volatile_store.clear()
+        self.__store.clear()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import typing
+
+from core.state_machine.State import State
+
+if typing.TYPE_CHECKING:
+    from core.state_machine.TransitionGroup import ConnectionType, TransitionGroup
+
+CompiledTransitionType: typing.TypeAlias = typing.Tuple[typing.Optional["TransitionGroup"],
+                                                        typing.Tuple["ConnectionType", ...]]
+
+
+class StateMachineTemplate:
+    """
+    States and transitions of a state machine, defined once and shared by every `StateMachine` built from it.
+
+    `compile` freezes the template and flattens each transition group into a tuple of connections, so that
+    transitions are looked up without going through the group. Compiled templates can no longer be changed.
+    """
+
+    def __init__(self):
+        self.__state_dict: typing.Dict[str, State] = {}
+        self.__transition_group_dict: typing.Dict[str, TransitionGroup] = {}
+        self.__start_state: typing.Optional[State] = None
+        self.__end_state: typing.Optional[State] = None
+        self.__transition_table: typing.Optional[typing.Dict[str, CompiledTransitionType]] = None
+
+    @property
+    def compiled(self) -> bool:
+        return self.__transition_table is not None
+
+    @property
+    def all_states(self) -> typing.List[State]:
+        return list(self.__state_dict.values())
+
+    @property
+    def all_transition_groups(self) -> typing.List[TransitionGroup]:
+        return list(self.__transition_group_dict.values())
+
+    @property
+    def start_state(self) -> typing.Optional[State]:
+        return self.__start_state
+
+    @start_state.setter
+    def start_state(self, value: State | str):
+        self.ensure_mutable()
+        if type(value) is str:
+            self.__start_state = self.__state_dict[value]
+            return
+
+        self.__start_state = value
+        if value.identifier not in self.__state_dict:
+            self.__state_dict[value.identifier] = value
+
+    @property
+    def end_state(self) -> typing.Optional[State]:
+        return self.__end_state
+
+    @end_state.setter
+    def end_state(self, value: State | str):
+        self.ensure_mutable()
+        if type(value) is str:
+            self.__end_state = self.__state_dict[value]
+            return
+
+        self.__end_state = value
+        if value.identifier not in self.__state_dict:
+            self.__state_dict[value.identifier] = value
+
+    def ensure_mutable(self):
+        if self.compiled:
+            raise RuntimeError("Compiled state machine templates cannot be changed")
+
+    def add_state(self, state: State):
+        self.ensure_mutable()
+        self.__state_dict[state.identifier] = state
+
+    def remove_state(self, state: State | str):
+        self.ensure_mutable()
+        if type(state) is str:
+            state = self.__state_dict[state]
+
+        # Remove state and corresponding transition group from dictionary
+        del self.__state_dict[state.identifier]
+        self.__transition_group_dict.pop(state.identifier, None)
+
+        # Remove all connections where the target state is a destination in each transition group
+        [transition_group.remove_connection(state)
+         for transition_group in self.__transition_group_dict.values()
+         if state in transition_group]
+
+        # Remove other references if necessary
+        if self.__start_state == state:
+            self.__start_state = None
+        if self.__end_state == state:
+            self.__end_state = None
+
+    def add_transition_group(self, source_state: State | str, transition_group: TransitionGroup):
+        self.ensure_mutable()
+        if type(source_state) is str:
+            source_state = self.__state_dict[source_state]
+        self.__transition_group_dict[source_state.identifier] = transition_group
+
+    def remove_transition_group(self, source_state: State | str):
+        self.ensure_mutable()
+        if type(source_state) is str:
+            source_state = self.__state_dict[source_state]
+        del self.__transition_group_dict[source_state.identifier]
+
+    def compile(self) -> StateMachineTemplate:
+        if not self.compiled:
+            self.__transition_table = {}
+            for identifier in self.__state_dict:
+                transition_group = self.__transition_group_dict.get(identifier)
+                connections = tuple(transition_group.items()) if transition_group is not None else ()
+                self.__transition_table[identifier] = (transition_group, connections)
+        return self
+
+    def transitions(self, state: State) -> CompiledTransitionType:
+        return self.__transition_table[state.identifier]
+
+    def __getitem__(self, key: str):
+        return self.__state_dict[key]
+
+    def __repr__(self):
+        return repr(self.__state_dict)
+
+    def __str__(self):
+        return str(self.__state_dict)
+
+    def __len__(self):
+        return len(self.__state_dict)
+
+    def __contains__(self, item: typing.Any):
+        return item in self.__state_dict
+
+    def __iter__(self):
+        return iter(self.__state_dict)
+
+    def keys(self):
+        return self.__state_dict.keys()
+
+    def values(self):
+        return self.__state_dict.values()
+
+    def items(self):
+        return self.__state_dict.items()
@@ -15,6 +15,7 @@ class CustomEventTypes:
     EVENT_CONFIG_DICT_UPDATED: int = None
     EVENT_CONFIG_FILE_UPDATED: int = None
     EVENT_STAGE_CHANGE_SCENE_REQUEST: int = None
+    EVENT_ASSET_PRELOAD_REQUEST: int = None
     EVENT_GAME_WIN: int = None
     EVENT_GAME_LOST: int = None
     EVENT_LEVEL_1_COLLIDE_FLOOR: int = None
@@ -9,6 +9,8 @@ HandlerCallable: typing.TypeAlias = typing.Callable[[pygame.event.Event], None]
 
 
 class EventHandler:
+    __slots__ = ("__identifier", "__callable")
+
     def __init__(self, identifier: str, callback: HandlerCallable):
         self.__identifier = identifier
         self.__callable = callback
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import random
+import typing
+
+import pygame.event
+
+
+class EventRecorder:
+    """
+    Records player input against simulation step numbers, so that a session can be replayed step for step.
+
+    Only input events are recorded; events the game posts itself are produced again by the replayed session.
+    Each input event keeps its index among the events of its step, so that it is replayed in the same order relative
+    to them. The session seeds the shared `random` generator, and the seed is stored with the recording.
+    Recordings are JSON: {"seed": int, "frames": int, "events": [[frame, type, attributes, index], ...]}.
+    """
+    RECORDED_EVENT_TYPES = (pygame.KEYDOWN, pygame.KEYUP, pygame.QUIT)
+
+    @staticmethod
+    def serialize(event: pygame.event.Event) -> typing.Dict[str, typing.Union[int, float, str, bool]]:
+        # Attributes such as the window object cannot be stored, nor do handlers need them
+        return {key: value for (key, value) in event.dict.items() if type(value) in (int, float, str, bool)}
+
+    def __init__(self, seed: typing.Optional[int] = None):
+        self.__logger = logging.getLogger(self.__class__.__name__)
+        self.__seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.__frame_count = 0
+        self.__events: typing.List[typing.Tuple[int, int, typing.Dict[str, typing.Any], int]] = []
+
+        random.seed(self.__seed)
+
+    @property
+    def seed(self) -> int:
+        return self.__seed
+
+    @property
+    def frame_count(self) -> int:
+        return self.__frame_count
+
+    def record(self, frame: int, events: typing.Iterable[pygame.event.Event]):
+        self.__frame_count = max(self.__frame_count, frame + 1)
+        self.__events.extend((frame, event.type, EventRecorder.serialize(event), index)
+                             for (index, event) in enumerate(events)
+                             if event.type in EventRecorder.RECORDED_EVENT_TYPES)
+
+    def save(self, file_path: str):
+        with open(file_path, "w") as f:
+            json.dump({"seed": self.__seed, "frames": self.__frame_count, "events": self.__events}, f)
+        self.__logger.info(f"Saved {len(self.__events)} events over {self.__frame_count} frames to {file_path}")
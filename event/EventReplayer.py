@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import collections
+import json
+import logging
+import random
+import sys
+import typing
+
+import pygame.event
+
+from event.EventRecorder import EventRecorder
+
+
+class EventReplayer:
+    """
+    Plays back a recording made by `EventRecorder`.
+
+    Loading a recording seeds the shared `random` generator with the recorded seed, so it has to happen before the
+    first scene is built. `replay` then puts the recorded input of a simulation step back among the events the game
+    posted for it.
+    """
+
+    def __init__(self, file_path: str):
+        self.__logger = logging.getLogger(self.__class__.__name__)
+        with open(file_path, "r") as f:
+            recording = json.load(f)
+
+        self.__seed: int = recording["seed"]
+        self.__frame_count: int = recording["frames"]
+        self.__events: typing.DefaultDict[int, typing.List[typing.Tuple[int, pygame.event.Event]]] = \
+            collections.defaultdict(list)
+        # Input of recordings without indices goes after the events the game posted
+        [self.__events[frame].append((index[0] if len(index) else sys.maxsize,
+                                      pygame.event.Event(event_type, attributes)))
+         for (frame, event_type, attributes, *index) in recording["events"]]
+
+        random.seed(self.__seed)
+        self.__logger.info(f"Loaded {len(recording['events'])} events over {self.__frame_count} frames "
+                           f"from {file_path}")
+
+    @property
+    def seed(self) -> int:
+        return self.__seed
+
+    @property
+    def frame_count(self) -> int:
+        return self.__frame_count
+
+    def events(self, frame: int) -> typing.List[pygame.event.Event]:
+        return [event for (_, event) in self.__events.get(frame, [])]
+
+    def replay(self, frame: int, queued_events: typing.List[pygame.event.Event]) -> typing.List[pygame.event.Event]:
+        # Input in the queue is dropped for the recorded one, which goes back to the index it was recorded at
+        events = [event for event in queued_events if event.type not in EventRecorder.RECORDED_EVENT_TYPES]
+        for (index, event) in self.__events.get(frame, []):
+            events.insert(index, event)
+        return events
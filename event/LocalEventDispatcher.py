@@ -57,13 +57,21 @@ class LocalEventDispatcher:
             proxy_handler = EventHandler("proxy", lambda _: None)
             self.__global_event_dispatcher.unregister(event_type, self.__identifier, proxy_handler)
 
-    def dispatch(self):
+    def dispatch(self, timeout: typing.Optional[float] = None):
+        # With a timeout, waits up to that long for the first event instead of returning on an empty queue
+        if timeout is not None:
+            try:
+                self.dispatch_event(self.__event_queue.get(timeout=timeout))
+            except queue.Empty:
+                return
+
         while not self.__event_queue.empty():
-            event = self.__event_queue.get()
+            self.dispatch_event(self.__event_queue.get())
 
-            if event.type not in self.__event_handler_dict:
-                continue
+    def dispatch_event(self, event: pygame.event.Event):
+        if event.type not in self.__event_handler_dict:
+            return
 
-            [catch_exception_and_print(lambda: handler.handle(event))
-             for handlers in self.__event_handler_dict[event.type].values()
-             for handler in handlers]
+        [catch_exception_and_print(lambda: handler.handle(event))
+         for handlers in self.__event_handler_dict[event.type].values()
+         for handler in handlers]
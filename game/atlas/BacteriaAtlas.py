@@ -27,7 +27,4 @@ class BacteriaAtlas(Atlas):
         super().update()
         if self.__map_navigator:
             self.__map_navigator.update()
-            self.position += (self.__map_navigator.direction_vector * self.__speed)
-
-    def render(self, surface: pygame.surface.Surface) -> None:
-        super().render(surface)
+            self.translate(self.__map_navigator.direction_vector * self.__speed)
@@ -23,6 +23,13 @@ class BacteriaAtlasGravity(Atlas):
         self.__damage = 1
         self.acceleration_y = self.G
 
+    def reset(self):
+        super().reset()
+        self.__first_touch_ground = False
+        self.__map_navigator = None
+        self.__hp = 1
+        self.acceleration_y = self.G
+
     @property
     def first_touch_ground(self):
         return self.__first_touch_ground
@@ -60,7 +67,4 @@ class BacteriaAtlasGravity(Atlas):
 
         if self.__map_navigator:
             self.__map_navigator.update()
-            self.position += (self.__map_navigator.direction_vector * self.__speed)
-
-    def render(self, surface: pygame.surface.Surface) -> None:
-        super().render(surface)
+            self.translate(self.__map_navigator.direction_vector * self.__speed)
@@ -6,6 +6,7 @@ import pygame
 
 from asset.AssetObjectFactory import AssetObjectFactory
 from core.object_model.Atlas import Atlas
+from core.object_model.AtlasPool import AtlasPool
 from core.object_model.TimedState import TimedState
 from game.atlas.BacteriaAtlasGravity import BacteriaAtlasGravity
 from game.atlas.BulletAtlas import BulletAtlas
@@ -24,10 +25,22 @@ class BossAtlas(Atlas):
         self.__hp = 20
         self.__bullet_speed = 5
         self.__fire_cd = TimedState(60 * 1)
+        self.__enemy_pool = AtlasPool(BacteriaAtlasGravity)
+        self.__bullet_pool = AtlasPool(
+            lambda: BulletAtlas(AssetObjectFactory().new_asset_object("asset.sprite.boss-projectile"))
+        )
 
         self.__time_elapsed = 0
         self.__prepare_time = 100
 
+    @property
+    def enemy_pool(self) -> AtlasPool[BacteriaAtlasGravity]:
+        return self.__enemy_pool
+
+    @property
+    def bullet_pool(self) -> AtlasPool[BulletAtlas]:
+        return self.__bullet_pool
+
     @property
     def hp(self):
         return self.__hp
@@ -37,21 +50,20 @@ class BossAtlas(Atlas):
         self.__hp = val
 
     def spawn_new_enemy(self):
-        bc1 = BacteriaAtlasGravity()
+        bc1 = self.__enemy_pool.acquire()
         bc1.position = self.position
         bc1.speed = (-1, -2)
         bc1.map_navigator = PatrolNavigator(bc1, self.__map_atlas, (2, 18))
         self.__enemy_list.append(bc1)
 
-        bc2 = BacteriaAtlasGravity()
+        bc2 = self.__enemy_pool.acquire()
         bc2.position = self.position
         bc2.speed = (-5, -3)
         bc2.map_navigator = PatrolNavigator(bc2, self.__map_atlas, (2, 18))
         self.__enemy_list.append(bc2)
 
     def fire(self):
-        sprite = AssetObjectFactory().new_asset_object("asset.sprite.boss-projectile")
-        bullet = BulletAtlas(sprite)
+        bullet = self.__bullet_pool.acquire()
         bullet.scale = (0.02, 0.02)
 
         fire_vec = pygame.Vector2(-1, 0) * self.__bullet_speed
@@ -75,6 +87,3 @@ class BossAtlas(Atlas):
             self.__fire_cd.start()
 
         self.__fire_cd.update()
-
-    def render(self, surface: pygame.surface.Surface) -> None:
-        super().render(surface)
@@ -3,6 +3,8 @@ from core.object_model.Sprite import Sprite
 
 
 class BulletAtlas(Atlas):
+    __slots__ = ("__damage",)
+
     def __init__(self, sprite: Sprite, damage: int = 1, **kwargs):
         super().__init__(sprite, **kwargs)
         self.__damage = damage
@@ -1,22 +1,49 @@
 # -*- coding: utf-8 -*-
+import itertools
+import math
 import typing
 from typing import Dict
 
 import pygame.surface
 
 from core.object_model.Atlas import Atlas
+from core.object_model.DrawList import DrawList
 from core.object_model.Map import Map
 from core.object_model.Sprite import Sprite
 from game.sprite.TileSprite import TileSprite
 from util import util
+from util.LRUCache import LRUCache
+
+OutlineType: typing.TypeAlias = typing.List[typing.Tuple[float, float]]
 
 
 class MapAtlas(Atlas):
-    def __init__(self, map_object: Map, texture_dict: Dict[int, Sprite], tile_size: int = 40, **kwargs):
+    CHUNK_TILE_COUNT = 16
+    CHUNK_CACHE_BUDGET = 64 * 1024 * 1024
+    CHUNK_EVICTION_MARGIN = 1
+
+    def __init__(self, map_object: Map, texture_dict: Dict[int, Sprite], tile_size: int = 40,
+                 chunk_tile_count: int = CHUNK_TILE_COUNT, chunk_cache_budget: int = CHUNK_CACHE_BUDGET,
+                 chunk_eviction_margin: int = CHUNK_EVICTION_MARGIN, **kwargs):
         self.__map_object = map_object
         self.__tile_sprite_dict: typing.Dict[Map.TileType, Sprite] = {}
+        self.__scaled_tile_surface_dict: typing.Dict[Map.TileType, pygame.surface.Surface] = {}
 
         self.__tile_size = tile_size
+        self.__chunk_tile_count = chunk_tile_count
+        self.__chunk_count = (math.ceil(map_object.tile_count[0] / chunk_tile_count),
+                              math.ceil(map_object.tile_count[1] / chunk_tile_count))
+
+        # Chunks are rasterized the first time they become visible and evicted once they are more than
+        # `chunk_eviction_margin` chunks out of view; the budget only bounds what is cached within that range
+        self.__chunk_cache = LRUCache(chunk_cache_budget, lambda chunk: chunk.get_pitch() * chunk.get_height(),
+                                      lambda chunk_index, _: self.__chunk_outline_dict.pop(chunk_index, None))
+        self.__chunk_eviction_margin = chunk_eviction_margin
+        # Visible chunk rows and columns as of the last eviction, which is only repeated when they change
+        self.__retained_chunk_range: typing.Optional[typing.Tuple[int, int, int, int]] = None
+        # Debug outlines of the wall components of cached chunks, relative to the map origin; they are dropped
+        # together with their chunk
+        self.__chunk_outline_dict: typing.Dict[typing.Tuple[int, int], typing.List[OutlineType]] = {}
 
         for tile_type in Map.TileType:
             try:
@@ -25,70 +52,221 @@ class MapAtlas(Atlas):
                 texture = None
             self.__tile_sprite_dict[tile_type] = TileSprite(tile_type, self.__tile_size, texture)
 
-        surface = pygame.surface.Surface(
-            (self.__tile_size * map_object.tile_count[1],
-             self.__tile_size * map_object.tile_count[0]), pygame.SRCALPHA).convert_alpha()
-
-        [surface.blit(self.__tile_sprite_dict[tile_type].surface,
-                      (j * self.__tile_size, i * self.__tile_size))
-         for i, row in enumerate(self.__map_object.tile_types)
-         for j, tile_type in enumerate(row)]
-
-        super().__init__(Sprite(surface), **kwargs)
-
-        # Generating masks
-        mask_surface = pygame.surface.Surface(surface.get_size(), depth=8)
-        mask_surface.set_colorkey(pygame.color.Color("white"))
-
-        tile_mask_surface = pygame.surface.Surface((self.__tile_size, self.__tile_size), depth=8)
-        tile_mask_surface.fill(pygame.color.Color("black"))
-
-        mask_surface.fill(pygame.color.Color("white"))
-        [mask_surface.blit(tile_mask_surface, (j * self.__tile_size, i * self.__tile_size))
-         for i, row in enumerate(self.__map_object.tile_types)
-         for j, tile_type in enumerate(row)
-         if tile_type == Map.TileType.WALL]
-        self.__wall_mask = pygame.mask.from_surface(mask_surface)
-
-        mask_surface.fill(pygame.color.Color("white"))
-        [mask_surface.blit(tile_mask_surface, (j * self.__tile_size, i * self.__tile_size))
-         for i, row in enumerate(self.__map_object.tile_types)
-         for j, tile_type in enumerate(row)
-         if tile_type == Map.TileType.EXIT]
-        self.__exit_mask = pygame.mask.from_surface(mask_surface)
-
-        mask_surface.fill(pygame.color.Color("white"))
-        [mask_surface.blit(tile_mask_surface, (j * self.__tile_size, i * self.__tile_size))
-         for i, row in enumerate(self.__map_object.tile_types)
-         for j, tile_type in enumerate(row)
-         if tile_type == Map.TileType.DEAD]
-        self.__dead_mask = pygame.mask.from_surface(mask_surface)
+        self.__tile_mask: typing.Optional[pygame.mask.Mask] = None
+
+        super().__init__(**kwargs)
 
     @property
     def map_object(self):
         return self.__map_object
 
     @property
-    def wall_mask(self):
-        return self.__wall_mask
+    def chunk_cache(self) -> LRUCache:
+        return self.__chunk_cache
+
+    @property
+    def tile_extent(self) -> typing.Tuple[float, float]:
+        return self.__tile_size * self.scale_x, self.__tile_size * self.scale_y
+
+    @property
+    def size(self) -> typing.Tuple[int, int]:
+        (tile_width, tile_height) = self.tile_extent
+        return (round(tile_width * self.__map_object.tile_count[1]),
+                round(tile_height * self.__map_object.tile_count[0]))
 
     @property
-    def exit_mask(self):
-        return self.__exit_mask
+    def rect(self) -> pygame.Rect:
+        return pygame.Rect(self.position_int, self.size)
 
     @property
-    def dead_mask(self):
-        return self.__dead_mask
-
-    # for debug use only
-    def render(self, surface: pygame.surface.Surface):
-        super().render(surface)
-        if self.SHOW_COLLIDE_BODY:
-            c_comp = self.wall_mask.connected_components()
-            for comp in c_comp:
-                outline = comp.outline(10)
-                outline = [(t[0] + self.position_x, t[1] + self.position_y) for t in outline]
-                pygame.draw.lines(surface, (0, 0, 255), True, outline, 3)
+    def tile_mask(self) -> pygame.mask.Mask:
+        if self.__tile_mask is None:
+            (tile_width, tile_height) = self.tile_extent
+            self.__tile_mask = pygame.mask.Mask((math.ceil(tile_width), math.ceil(tile_height)), True)
+        return self.__tile_mask
+
+    def update_surface_cache_scale(self, key: typing.Optional[str] = None):
+        super().update_surface_cache_scale(key)
+        self.__tile_mask = None
+        self.__scaled_tile_surface_dict.clear()
+        self.__chunk_cache.clear()
+        self.__chunk_outline_dict.clear()
+        self.__retained_chunk_range = None
+
+    def tile_range(self, rect: pygame.Rect) -> typing.Tuple[range, range]:
+        (tile_width, tile_height) = self.tile_extent
+        (tile_count_i, tile_count_j) = self.__map_object.tile_count
+        (x, y) = self.position
+
+        # Rectangles are widened by a pixel since mask offsets are truncated rather than floored
+        first_i = max(math.floor((rect.top - 1 - y) / tile_height), 0)
+        first_j = max(math.floor((rect.left - 1 - x) / tile_width), 0)
+        last_i = min(math.floor((rect.bottom + 1 - y) / tile_height) + 1, tile_count_i)
+        last_j = min(math.floor((rect.right + 1 - x) / tile_width) + 1, tile_count_j)
+        return range(first_i, last_i), range(first_j, last_j)
+
+    def query_tiles(self, rect: pygame.Rect) -> typing.List[typing.Tuple[typing.Tuple[int, int], Map.TileType,
+                                                                         pygame.Rect]]:
+        """
+        Look up the tiles under a rectangle in screen coordinates.
+        Returns grid index, tile type and screen rectangle of every tile that the rectangle touches.
+        """
+        (tile_width, tile_height) = self.tile_extent
+        (x, y) = self.position_int
+        (range_i, range_j) = self.tile_range(rect)
+        tile_types = self.__map_object.tile_types
+        return [((i, j), tile_types[i][j],
+                 pygame.Rect(x + round(j * tile_width), y + round(i * tile_height),
+                             math.ceil(tile_width), math.ceil(tile_height)))
+                for i in range_i
+                for j in range_j]
+
+    def tile_offsets(self, atlas: Atlas, tile_type: Map.TileType) -> typing.List[typing.Tuple[int, int]]:
+        # Offsets of the matching tiles relative to the atlas, truncated the same way as a map-sized mask would be
+        (tile_width, tile_height) = self.tile_extent
+        (range_i, range_j) = self.tile_range(atlas.rect)
+        offset_x = int(self.position_x - atlas.position_x)
+        offset_y = int(self.position_y - atlas.position_y)
+        tile_types = self.__map_object.tile_types
+        return [(offset_x + round(j * tile_width), offset_y + round(i * tile_height))
+                for i in range_i
+                for j in range_j
+                if tile_types[i][j] == tile_type]
+
+    def collides_tile_type(self, atlas: Atlas, tile_type: Map.TileType) -> typing.Optional[typing.Tuple[int, int]]:
+        # Box colliders are answered from the tile rectangles alone
+        box_collider = atlas.box_collider
+        for offset in self.tile_offsets(atlas, tile_type):
+            if box_collider:
+                point = atlas.collides_box(self.tile_mask.get_size(), offset)
+            else:
+                point = atlas.collides_mask(self.tile_mask, offset)
+            if point:
+                return point
+        return None
+
+    def overlap_mask_tile_type(self, atlas: Atlas, tile_type: Map.TileType) -> pygame.mask.Mask:
+        tile_type_mask = pygame.mask.Mask(atlas.surface.get_size())
+        [tile_type_mask.draw(self.tile_mask, offset) for offset in self.tile_offsets(atlas, tile_type)]
+        return atlas.mask.overlap_mask(tile_type_mask, (0, 0))
+
+    def chunk_mask(self, chunk_index: typing.Tuple[int, int], tile_type: Map.TileType) -> pygame.mask.Mask:
+        (tile_width, tile_height) = self.tile_extent
+        (tile_count_i, tile_count_j) = self.__map_object.tile_count
+        first_i = chunk_index[0] * self.__chunk_tile_count
+        first_j = chunk_index[1] * self.__chunk_tile_count
+        last_i = min(first_i + self.__chunk_tile_count, tile_count_i)
+        last_j = min(first_j + self.__chunk_tile_count, tile_count_j)
+
+        tile_types = self.__map_object.tile_types
+        mask = pygame.mask.Mask((math.ceil((last_j - first_j) * tile_width),
+                                 math.ceil((last_i - first_i) * tile_height)))
+        [mask.draw(self.tile_mask, ((j - first_j) * tile_width, (i - first_i) * tile_height))
+         for i in range(first_i, last_i)
+         for j in range(first_j, last_j)
+         if tile_types[i][j] == tile_type]
+        return mask
+
+    def rasterize_chunk(self, chunk_index: typing.Tuple[int, int]) -> pygame.surface.Surface:
+        (tile_width, tile_height) = self.tile_extent
+        if not self.__scaled_tile_surface_dict:
+            self.__scaled_tile_surface_dict = {
+                tile_type: pygame.transform.scale(sprite.surface, (math.ceil(tile_width), math.ceil(tile_height)))
+                for tile_type, sprite in self.__tile_sprite_dict.items()
+            }
+
+        (tile_count_i, tile_count_j) = self.__map_object.tile_count
+        first_i = chunk_index[0] * self.__chunk_tile_count
+        first_j = chunk_index[1] * self.__chunk_tile_count
+        last_i = min(first_i + self.__chunk_tile_count, tile_count_i)
+        last_j = min(first_j + self.__chunk_tile_count, tile_count_j)
+
+        # Tiles are placed on absolute map coordinates so that chunk seams line up under fractional scales
+        (origin_x, origin_y) = (round(first_j * tile_width), round(first_i * tile_height))
+        chunk = pygame.surface.Surface(
+            (round(last_j * tile_width) - origin_x, round(last_i * tile_height) - origin_y), pygame.SRCALPHA
+        ).convert_alpha()
+        tile_types = self.__map_object.tile_types
+        chunk.blits([(self.__scaled_tile_surface_dict[tile_types[i][j]],
+                      (round(j * tile_width) - origin_x, round(i * tile_height) - origin_y))
+                     for i in range(first_i, last_i)
+                     for j in range(first_j, last_j)], False)
+        return chunk
+
+    def get_chunk(self, chunk_index: typing.Tuple[int, int]) -> pygame.surface.Surface:
+        chunk = self.__chunk_cache.get(chunk_index)
+        if chunk is None:
+            chunk = self.rasterize_chunk(chunk_index)
+            self.__chunk_cache.put(chunk_index, chunk)
+        return chunk
+
+    def evict_far_chunks(self, rows: range, columns: range):
+        retained_chunk_range = (rows.start, rows.stop, columns.start, columns.stop)
+        if retained_chunk_range == self.__retained_chunk_range:
+            return
+
+        self.__retained_chunk_range = retained_chunk_range
+        margin = self.__chunk_eviction_margin
+        [self.__chunk_cache.evict(chunk_index) for chunk_index in list(self.__chunk_cache)
+         if not (rows.start - margin <= chunk_index[0] < rows.stop + margin
+                 and columns.start - margin <= chunk_index[1] < columns.stop + margin)]
+
+    def chunk_outlines(self, chunk_index: typing.Tuple[int, int]) -> typing.List[OutlineType]:
+        outlines = self.__chunk_outline_dict.get(chunk_index)
+        if outlines is None:
+            (chunk_width, chunk_height) = self.chunk_extent
+            (origin_x, origin_y) = (chunk_index[1] * chunk_width, chunk_index[0] * chunk_height)
+            outlines = [[(px + origin_x, py + origin_y) for (px, py) in outline]
+                        for outline in (component.outline(10) for component
+                                        in self.chunk_mask(chunk_index, Map.TileType.WALL).connected_components())
+                        if len(outline) > 1]
+            self.__chunk_outline_dict[chunk_index] = outlines
+        return outlines
+
+    @property
+    def chunk_extent(self) -> typing.Tuple[float, float]:
+        (tile_width, tile_height) = self.tile_extent
+        return tile_width * self.__chunk_tile_count, tile_height * self.__chunk_tile_count
+
+    def visible_chunk_range(self, view_rect: typing.Optional[pygame.Rect]) -> typing.Tuple[range, range]:
+        if view_rect is None:
+            return range(self.__chunk_count[0]), range(self.__chunk_count[1])
+
+        (x, y) = self.position
+        x -= view_rect.x
+        y -= view_rect.y
+        (chunk_width, chunk_height) = self.chunk_extent
+        first_i = max(math.floor(-y / chunk_height), 0)
+        first_j = max(math.floor(-x / chunk_width), 0)
+        last_i = min(math.ceil((view_rect.height - y) / chunk_height), self.__chunk_count[0])
+        last_j = min(math.ceil((view_rect.width - x) / chunk_width), self.__chunk_count[1])
+        return range(first_i, last_i), range(first_j, last_j)
+
+    def collect(self, draw_list: DrawList, view_rect: typing.Optional[pygame.Rect] = None):
+        (x, y) = self.position
+        if view_rect is not None:
+            x -= view_rect.x
+            y -= view_rect.y
+
+        # Only chunks that intersect the view are drawn (and rasterized if not cached yet)
+        (chunk_width, chunk_height) = self.chunk_extent
+        (rows, columns) = self.visible_chunk_range(view_rect)
+        self.evict_far_chunks(rows, columns)
+        draw_list.blit_entries.extend(
+            (self.get_chunk((i, j)), (round(x + j * chunk_width), round(y + i * chunk_height)), None)
+            for i in rows
+            for j in columns
+        )
+
+        # for debug use only
+        if not self.SHOW_COLLIDE_BODY:
+            return
+        # Outlines are traced once per chunk and scale; only their translation is done per frame
+        for (i, j) in itertools.product(rows, columns):
+            draw_list.debug_entries.extend(
+                ((0, 0, 255), [(px + x, py + y) for (px, py) in outline], 3)
+                for outline in self.chunk_outlines((i, j))
+            )
 
     def grid_to_screen_position(self, grid_position: pygame.Vector2,
                                 element_size: typing.Optional[
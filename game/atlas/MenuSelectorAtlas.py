@@ -5,6 +5,7 @@ import pygame
 
 from asset.AssetObjectFactory import AssetObjectFactory
 from core.object_model.Atlas import Atlas
+from core.object_model.DrawList import DrawList
 
 AnchorType: typing.TypeAlias = typing.Tuple[float, typing.Callable]
 
@@ -20,10 +21,10 @@ class MenuSelectorAtlas(Atlas):
         if len(self.__anchors) and self.__current_anchor_index < 0:
             self.__current_anchor_index = 0
 
-    def render(self, surface: pygame.surface.Surface):
+    def collect(self, draw_list: DrawList, view_rect: typing.Optional[pygame.Rect] = None):
         if self.__current_anchor_index < 0:
             return
-        super().render(surface)
+        super().collect(draw_list, view_rect)
 
     def update(self):
         super().update()
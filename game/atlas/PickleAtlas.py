@@ -6,144 +6,253 @@ import pygame
 from asset.AssetObjectFactory import AssetObjectFactory
 from core.object_model.Atlas import Atlas
 from core.state_machine.State import State
+from core.state_machine.StateContext import StateContext
 from core.state_machine.StateMachine import StateMachine
+from core.state_machine.StateMachineTemplate import StateMachineTemplate
 from core.state_machine.TransitionGroup import TransitionGroup
 
 
 class IdleState(State):
-    def __init__(self, **kwargs):
-        super().__init__("idle", **kwargs)
+    def __init__(self):
+        super().__init__("idle")
 
-    def before_entry(self):
-        self.persistent_store["atlas"].current_sprite_key = "idle"
+    def before_entry(self, context: StateContext):
+        context.persistent_store["atlas"].current_sprite_key = "idle"
 
 
 class WalkState(State):
     WALK_SPEED = 3
     DIAGONAL_WALK_SPEED = math.sqrt(2) / 2 * WALK_SPEED
 
-    def before_entry(self):
-        self.volatile_store["counter"] = 0
+    def before_entry(self, context: StateContext):
+        context.volatile_store["counter"] = 0
 
-    def update(self):
-        counter = self.volatile_store["counter"]
+    def update(self, context: StateContext):
+        counter = context.volatile_store["counter"]
         divided_counter = counter // 10
         if divided_counter % 2:
-            self.persistent_store["atlas"].current_sprite_key = "walking-2"
+            context.persistent_store["atlas"].current_sprite_key = "walking-2"
         else:
-            self.persistent_store["atlas"].current_sprite_key = "walking-1"
+            context.persistent_store["atlas"].current_sprite_key = "walking-1"
 
         if counter > 1000:
-            self.volatile_store["counter"] = 0
+            context.volatile_store["counter"] = 0
             return
-        self.volatile_store["counter"] += 1
+        context.volatile_store["counter"] += 1
 
 
 class WalkNorthState(WalkState):
-    def __init__(self, **kwargs):
-        super().__init__("walk-north", **kwargs)
+    def __init__(self):
+        super().__init__("walk-north")
 
-    def before_entry(self):
-        super().before_entry()
-        self.persistent_store["atlas"].speed_y = -WalkState.WALK_SPEED
+    def before_entry(self, context: StateContext):
+        super().before_entry(context)
+        context.persistent_store["atlas"].speed_y = -WalkState.WALK_SPEED
 
-    def before_leave(self):
-        self.persistent_store["atlas"].speed_y = 0
+    def before_leave(self, context: StateContext):
+        context.persistent_store["atlas"].speed_y = 0
 
 
 class WalkSouthState(WalkState):
-    def __init__(self, **kwargs):
-        super().__init__("walk-south", **kwargs)
+    def __init__(self):
+        super().__init__("walk-south")
 
-    def before_entry(self):
-        super().before_entry()
-        self.persistent_store["atlas"].speed_y = WalkState.WALK_SPEED
+    def before_entry(self, context: StateContext):
+        super().before_entry(context)
+        context.persistent_store["atlas"].speed_y = WalkState.WALK_SPEED
 
-    def before_leave(self):
-        self.persistent_store["atlas"].speed_y = 0
+    def before_leave(self, context: StateContext):
+        context.persistent_store["atlas"].speed_y = 0
 
 
 class WalkWestState(WalkState):
-    def __init__(self, **kwargs):
-        super().__init__("walk-west", **kwargs)
+    def __init__(self):
+        super().__init__("walk-west")
 
-    def before_entry(self):
-        super().before_entry()
-        self.persistent_store["atlas"].speed_x = -WalkState.WALK_SPEED
+    def before_entry(self, context: StateContext):
+        super().before_entry(context)
+        context.persistent_store["atlas"].speed_x = -WalkState.WALK_SPEED
 
-    def before_leave(self):
-        self.persistent_store["atlas"].speed_x = 0
+    def before_leave(self, context: StateContext):
+        context.persistent_store["atlas"].speed_x = 0
 
 
 class WalkEastState(WalkState):
-    def __init__(self, **kwargs):
-        super().__init__("walk-east", **kwargs)
+    def __init__(self):
+        super().__init__("walk-east")
 
-    def before_entry(self):
-        super().before_entry()
-        self.persistent_store["atlas"].speed_x = WalkState.WALK_SPEED
+    def before_entry(self, context: StateContext):
+        super().before_entry(context)
+        context.persistent_store["atlas"].speed_x = WalkState.WALK_SPEED
 
-    def before_leave(self):
-        self.persistent_store["atlas"].speed_x = 0
+    def before_leave(self, context: StateContext):
+        context.persistent_store["atlas"].speed_x = 0
 
 
 class WalkNorthWestState(WalkState):
-    def __init__(self, **kwargs):
-        super().__init__("walk-north-west", **kwargs)
+    def __init__(self):
+        super().__init__("walk-north-west")
 
-    def before_entry(self):
-        super().before_entry()
-        self.persistent_store["atlas"].speed_x = -WalkState.DIAGONAL_WALK_SPEED
-        self.persistent_store["atlas"].speed_y = -WalkState.DIAGONAL_WALK_SPEED
+    def before_entry(self, context: StateContext):
+        super().before_entry(context)
+        context.persistent_store["atlas"].speed_x = -WalkState.DIAGONAL_WALK_SPEED
+        context.persistent_store["atlas"].speed_y = -WalkState.DIAGONAL_WALK_SPEED
 
-    def before_leave(self):
-        self.persistent_store["atlas"].speed_x = 0
-        self.persistent_store["atlas"].speed_y = 0
+    def before_leave(self, context: StateContext):
+        context.persistent_store["atlas"].speed_x = 0
+        context.persistent_store["atlas"].speed_y = 0
 
 
 class WalkNorthEastState(WalkState):
-    def __init__(self, **kwargs):
-        super().__init__("walk-north-east", **kwargs)
+    def __init__(self):
+        super().__init__("walk-north-east")
 
-    def before_entry(self):
-        super().before_entry()
-        self.persistent_store["atlas"].speed_x = WalkState.DIAGONAL_WALK_SPEED
-        self.persistent_store["atlas"].speed_y = -WalkState.DIAGONAL_WALK_SPEED
+    def before_entry(self, context: StateContext):
+        super().before_entry(context)
+        context.persistent_store["atlas"].speed_x = WalkState.DIAGONAL_WALK_SPEED
+        context.persistent_store["atlas"].speed_y = -WalkState.DIAGONAL_WALK_SPEED
 
-    def before_leave(self):
-        self.persistent_store["atlas"].speed_x = 0
-        self.persistent_store["atlas"].speed_y = 0
+    def before_leave(self, context: StateContext):
+        context.persistent_store["atlas"].speed_x = 0
+        context.persistent_store["atlas"].speed_y = 0
 
 
 class WalkSouthWestState(WalkState):
-    def __init__(self, **kwargs):
-        super().__init__("walk-south-west", **kwargs)
+    def __init__(self):
+        super().__init__("walk-south-west")
 
-    def before_entry(self):
-        super().before_entry()
-        self.persistent_store["atlas"].speed_x = -WalkState.DIAGONAL_WALK_SPEED
-        self.persistent_store["atlas"].speed_y = WalkState.DIAGONAL_WALK_SPEED
+    def before_entry(self, context: StateContext):
+        super().before_entry(context)
+        context.persistent_store["atlas"].speed_x = -WalkState.DIAGONAL_WALK_SPEED
+        context.persistent_store["atlas"].speed_y = WalkState.DIAGONAL_WALK_SPEED
 
-    def before_leave(self):
-        self.persistent_store["atlas"].speed_x = 0
-        self.persistent_store["atlas"].speed_y = 0
+    def before_leave(self, context: StateContext):
+        context.persistent_store["atlas"].speed_x = 0
+        context.persistent_store["atlas"].speed_y = 0
 
 
 class WalkSouthEastState(WalkState):
-    def __init__(self, **kwargs):
-        super().__init__("walk-south-east", **kwargs)
-
-    def before_entry(self):
-        super().before_entry()
-        self.persistent_store["atlas"].speed_x = WalkState.DIAGONAL_WALK_SPEED
-        self.persistent_store["atlas"].speed_y = WalkState.DIAGONAL_WALK_SPEED
-
-    def before_leave(self):
-        self.persistent_store["atlas"].speed_x = 0
-        self.persistent_store["atlas"].speed_y = 0
+    def __init__(self):
+        super().__init__("walk-south-east")
+
+    def before_entry(self, context: StateContext):
+        super().before_entry(context)
+        context.persistent_store["atlas"].speed_x = WalkState.DIAGONAL_WALK_SPEED
+        context.persistent_store["atlas"].speed_y = WalkState.DIAGONAL_WALK_SPEED
+
+    def before_leave(self, context: StateContext):
+        context.persistent_store["atlas"].speed_x = 0
+        context.persistent_store["atlas"].speed_y = 0
+
+
+def build_state_machine_template() -> StateMachineTemplate:
+    template = StateMachineTemplate()
+    template.add_state(IdleState())
+    template.add_state(WalkNorthState())
+    template.add_state(WalkSouthState())
+    template.add_state(WalkWestState())
+    template.add_state(WalkEastState())
+    template.add_state(WalkNorthWestState())
+    template.add_state(WalkNorthEastState())
+    template.add_state(WalkSouthWestState())
+    template.add_state(WalkSouthEastState())
+    template.add_transition_group(
+        "idle",
+        TransitionGroup(
+            (template["walk-north"],
+             lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_UP),
+            (template["walk-south"],
+             lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_DOWN),
+            (template["walk-west"],
+             lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_LEFT),
+            (template["walk-east"],
+             lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_RIGHT)
+        ))
+    template.add_transition_group(
+        "walk-north",
+        TransitionGroup(
+            (template["idle"],
+             lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_UP),
+            (template["walk-north-west"],
+             lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_LEFT),
+            (template["walk-north-east"],
+             lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_RIGHT)
+        ))
+    template.add_transition_group(
+        "walk-south",
+        TransitionGroup(
+            (template["idle"],
+             lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_DOWN),
+            (template["walk-south-west"],
+             lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_LEFT),
+            (template["walk-south-east"],
+             lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_RIGHT)
+        ))
+    template.add_transition_group(
+        "walk-west",
+        TransitionGroup(
+            (template["idle"],
+             lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_LEFT),
+            (template["walk-north-west"],
+             lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_UP),
+            (template["walk-south-west"],
+             lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_DOWN)
+        ))
+    template.add_transition_group(
+        "walk-east",
+        TransitionGroup(
+            (template["idle"],
+             lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_RIGHT),
+            (template["walk-north-east"],
+             lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_UP),
+            (template["walk-south-east"],
+             lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_DOWN)
+        ))
+
+    template.add_transition_group(
+        "walk-north-west",
+        TransitionGroup(
+            (template["walk-north"],
+             lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_LEFT),
+            (template["walk-west"],
+             lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_UP)
+        ))
+
+    template.add_transition_group(
+        "walk-north-east",
+        TransitionGroup(
+            (template["walk-north"],
+             lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_RIGHT),
+            (template["walk-east"],
+             lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_UP)
+        ))
+
+    template.add_transition_group(
+        "walk-south-west",
+        TransitionGroup(
+            (template["walk-south"],
+             lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_LEFT),
+            (template["walk-west"],
+             lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_DOWN)
+        ))
+
+    template.add_transition_group(
+        "walk-south-east",
+        TransitionGroup(
+            (template["walk-south"],
+             lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_RIGHT),
+            (template["walk-east"],
+             lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_DOWN)
+        ))
+
+    template.start_state = "idle"
+    return template.compile()
 
 
 class PickleAtlas(Atlas):
+    # Shared by all instances, each of which only runs its own StateMachine over it
+    STATE_MACHINE_TEMPLATE = build_state_machine_template()
+
     def __init__(self):
         super().__init__()
         asset_object_factory = AssetObjectFactory()
@@ -151,106 +260,7 @@ class PickleAtlas(Atlas):
         self["walking-1"] = asset_object_factory.new_asset_object("asset.sprite.pickle.1")
         self["walking-2"] = asset_object_factory.new_asset_object("asset.sprite.pickle.2")
 
-        self.__state_machine = StateMachine()
-        self.__state_machine.add_state(IdleState(atlas=self))
-        self.__state_machine.add_state(WalkNorthState(atlas=self))
-        self.__state_machine.add_state(WalkSouthState(atlas=self))
-        self.__state_machine.add_state(WalkWestState(atlas=self))
-        self.__state_machine.add_state(WalkEastState(atlas=self))
-        self.__state_machine.add_state(WalkNorthWestState(atlas=self))
-        self.__state_machine.add_state(WalkNorthEastState(atlas=self))
-        self.__state_machine.add_state(WalkSouthWestState(atlas=self))
-        self.__state_machine.add_state(WalkSouthEastState(atlas=self))
-        self.__state_machine.add_transition_group(
-            "idle",
-            TransitionGroup(
-                (self.__state_machine["walk-north"],
-                 lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_UP),
-                (self.__state_machine["walk-south"],
-                 lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_DOWN),
-                (self.__state_machine["walk-west"],
-                 lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_LEFT),
-                (self.__state_machine["walk-east"],
-                 lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_RIGHT)
-            ))
-        self.__state_machine.add_transition_group(
-            "walk-north",
-            TransitionGroup(
-                (self.__state_machine["idle"],
-                 lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_UP),
-                (self.__state_machine["walk-north-west"],
-                 lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_LEFT),
-                (self.__state_machine["walk-north-east"],
-                 lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_RIGHT)
-            ))
-        self.__state_machine.add_transition_group(
-            "walk-south",
-            TransitionGroup(
-                (self.__state_machine["idle"],
-                 lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_DOWN),
-                (self.__state_machine["walk-south-west"],
-                 lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_LEFT),
-                (self.__state_machine["walk-south-east"],
-                 lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_RIGHT)
-            ))
-        self.__state_machine.add_transition_group(
-            "walk-west",
-            TransitionGroup(
-                (self.__state_machine["idle"],
-                 lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_LEFT),
-                (self.__state_machine["walk-north-west"],
-                 lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_UP),
-                (self.__state_machine["walk-south-west"],
-                 lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_DOWN)
-            ))
-        self.__state_machine.add_transition_group(
-            "walk-east",
-            TransitionGroup(
-                (self.__state_machine["idle"],
-                 lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_RIGHT),
-                (self.__state_machine["walk-north-east"],
-                 lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_UP),
-                (self.__state_machine["walk-south-east"],
-                 lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_DOWN)
-            ))
-
-        self.__state_machine.add_transition_group(
-            "walk-north-west",
-            TransitionGroup(
-                (self.__state_machine["walk-north"],
-                 lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_LEFT),
-                (self.__state_machine["walk-west"],
-                 lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_UP)
-            ))
-
-        self.__state_machine.add_transition_group(
-            "walk-north-east",
-            TransitionGroup(
-                (self.__state_machine["walk-north"],
-                 lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_RIGHT),
-                (self.__state_machine["walk-east"],
-                 lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_UP)
-            ))
-
-        self.__state_machine.add_transition_group(
-            "walk-south-west",
-            TransitionGroup(
-                (self.__state_machine["walk-south"],
-                 lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_LEFT),
-                (self.__state_machine["walk-west"],
-                 lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_DOWN)
-            ))
-
-        self.__state_machine.add_transition_group(
-            "walk-south-east",
-            TransitionGroup(
-                (self.__state_machine["walk-south"],
-                 lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_RIGHT),
-                (self.__state_machine["walk-east"],
-                 lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_DOWN)
-            ))
-
-        self.__state_machine.start_state = "idle"
+        self.__state_machine = StateMachine(PickleAtlas.STATE_MACHINE_TEMPLATE, atlas=self)
         self.__state_machine.reset()
 
     def update(self):
@@ -7,9 +7,12 @@ import pygame
 from asset.AssetObjectFactory import AssetObjectFactory
 from config.ConfigManager import ConfigManager
 from core.object_model.Atlas import Atlas
+from core.object_model.AtlasPool import AtlasPool
 from core.object_model.TimedState import TimedState
 from core.state_machine.State import State
+from core.state_machine.StateContext import StateContext
 from core.state_machine.StateMachine import StateMachine
+from core.state_machine.StateMachineTemplate import StateMachineTemplate
 from core.state_machine.TransitionGroup import TransitionGroup
 from event.CustomEventTypes import CustomEventTypes
 from game.atlas.BulletAtlas import BulletAtlas
@@ -17,70 +20,129 @@ from game.atlas.PickleAtlas import WalkState
 
 
 class IdleStateHorizontal(State):
-    def __init__(self, **kwargs):
-        super().__init__("idle", **kwargs)
+    def __init__(self):
+        super().__init__("idle")
 
-    def before_entry(self):
-        self.persistent_store["atlas"].current_sprite_key = "idle"
+    def before_entry(self, context: StateContext):
+        context.persistent_store["atlas"].current_sprite_key = "idle"
 
 
 class WalkLeftState(WalkState):
-    def __init__(self, **kwargs):
-        super().__init__("walk-left", **kwargs)
+    def __init__(self):
+        super().__init__("walk-left")
 
-    def before_entry(self):
-        super().before_entry()
-        self.persistent_store["atlas"].speed_x = -WalkState.WALK_SPEED
-        self.persistent_store["atlas"].direction = "left"
+    def before_entry(self, context: StateContext):
+        super().before_entry(context)
+        context.persistent_store["atlas"].speed_x = -WalkState.WALK_SPEED
+        context.persistent_store["atlas"].direction = "left"
 
-    def before_leave(self):
-        self.persistent_store["atlas"].speed_x = 0
+    def before_leave(self, context: StateContext):
+        context.persistent_store["atlas"].speed_x = 0
 
 
 class WalkRightState(WalkState):
-    def __init__(self, **kwargs):
-        super().__init__("walk-right", **kwargs)
+    def __init__(self):
+        super().__init__("walk-right")
 
-    def before_entry(self):
-        super().before_entry()
-        self.persistent_store["atlas"].speed_x = WalkState.WALK_SPEED
-        self.persistent_store["atlas"].direction = "right"
+    def before_entry(self, context: StateContext):
+        super().before_entry(context)
+        context.persistent_store["atlas"].speed_x = WalkState.WALK_SPEED
+        context.persistent_store["atlas"].direction = "right"
 
-    def before_leave(self):
-        self.persistent_store["atlas"].speed_x = 0
+    def before_leave(self, context: StateContext):
+        context.persistent_store["atlas"].speed_x = 0
 
 
 class IdleStateVertical(State):
-    def __init__(self, **kwargs):
-        super().__init__("idle", **kwargs)
+    def __init__(self):
+        super().__init__("idle")
 
 
 class JumpUpState(State):
     # Acceleration when jumping up
     A = 5
 
-    def __init__(self, **kwargs):
-        super().__init__("jump-up", **kwargs)
+    def __init__(self):
+        super().__init__("jump-up")
 
-    def before_entry(self):
-        self.volatile_store["accelerated"] = False
+    def before_entry(self, context: StateContext):
+        context.volatile_store["accelerated"] = False
 
-    def update(self):
-        if self.volatile_store["accelerated"]:
+    def update(self, context: StateContext):
+        if context.volatile_store["accelerated"]:
             return
 
-        self.persistent_store["atlas"].speed_y -= JumpUpState.A
-        self.volatile_store["accelerated"] = True
+        context.persistent_store["atlas"].speed_y -= JumpUpState.A
+        context.volatile_store["accelerated"] = True
 
 
 class MidAirState(State):
-    def __init__(self, **kwargs):
-        super().__init__("mid-air", **kwargs)
+    def __init__(self):
+        super().__init__("mid-air")
+
+
+def build_horizontal_state_machine_template() -> StateMachineTemplate:
+    template = StateMachineTemplate()
+    template.add_state(IdleStateHorizontal())
+    template.add_state(WalkLeftState())
+    template.add_state(WalkRightState())
+    template.add_transition_group(
+        "idle",
+        TransitionGroup(
+            (template["walk-left"],
+             lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_LEFT),
+            (template["walk-right"],
+             lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_RIGHT)
+        ))
+    template.add_transition_group(
+        "walk-left",
+        TransitionGroup(
+            (template["idle"],
+             lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_LEFT)
+        ))
+    template.add_transition_group(
+        "walk-right",
+        TransitionGroup(
+            (template["idle"],
+             lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_RIGHT)
+        ))
+
+    template.start_state = "idle"
+    return template.compile()
+
+
+def build_vertical_state_machine_template() -> StateMachineTemplate:
+    template = StateMachineTemplate()
+    template.add_state(IdleStateVertical())
+    template.add_state(JumpUpState())
+    template.add_state(MidAirState())
+    template.add_transition_group(
+        "idle",
+        TransitionGroup(
+            (template["jump-up"],
+             lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_UP)
+        ))
+    template.add_transition_group(
+        "jump-up",
+        TransitionGroup(
+            (template["mid-air"], lambda _, e: True)
+        ))
+    template.add_transition_group(
+        "mid-air",
+        TransitionGroup(
+            (template["idle"],
+             lambda _, e: e.type == CustomEventTypes.EVENT_LEVEL_1_COLLIDE_FLOOR)
+        ))
+    template.start_state = "idle"
+    return template.compile()
 
 
 class PickleAtlasGravity(Atlas):
     # Gravitational acceleration
     G = 0.1
+    # Shared by all instances, each of which only runs its own StateMachines over them
+    HORIZONTAL_STATE_MACHINE_TEMPLATE = build_horizontal_state_machine_template()
+    VERTICAL_STATE_MACHINE_TEMPLATE = build_vertical_state_machine_template()
 
     def __init__(self, bullet_list: List[BulletAtlas] = None):
         super().__init__()
@@ -95,62 +157,19 @@ class PickleAtlasGravity(Atlas):
         if bullet_list is None:
             bullet_list = []
         self.__bullet_list = bullet_list
+        self.__bullet_pool = AtlasPool(
+            lambda: BulletAtlas(AssetObjectFactory().new_asset_object("asset.sprite.pickle-projectile"))
+        )
 
         # used for specifying firing direction for now
         self.direction = "right"
 
         self.__hp = 5
 
-        self.__state_machine_horizontal = StateMachine()
-        self.__state_machine_horizontal.add_state(IdleStateHorizontal(atlas=self))
-        self.__state_machine_horizontal.add_state(WalkLeftState(atlas=self))
-        self.__state_machine_horizontal.add_state(WalkRightState(atlas=self))
-        self.__state_machine_horizontal.add_transition_group(
-            "idle",
-            TransitionGroup(
-                (self.__state_machine_horizontal["walk-left"],
-                 lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_LEFT),
-                (self.__state_machine_horizontal["walk-right"],
-                 lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_RIGHT)
-            ))
-        self.__state_machine_horizontal.add_transition_group(
-            "walk-left",
-            TransitionGroup(
-                (self.__state_machine_horizontal["idle"],
-                 lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_LEFT)
-            ))
-        self.__state_machine_horizontal.add_transition_group(
-            "walk-right",
-            TransitionGroup(
-                (self.__state_machine_horizontal["idle"],
-                 lambda _, e: e.type == pygame.KEYUP and e.key == pygame.K_RIGHT)
-            ))
-
-        self.__state_machine_horizontal.start_state = "idle"
+        self.__state_machine_horizontal = StateMachine(PickleAtlasGravity.HORIZONTAL_STATE_MACHINE_TEMPLATE,
+                                                       atlas=self)
         self.__state_machine_horizontal.reset()
-
-        self.__state_machine_vertical = StateMachine()
-        self.__state_machine_vertical.add_state(IdleStateVertical(atlas=self))
-        self.__state_machine_vertical.add_state(JumpUpState(atlas=self))
-        self.__state_machine_vertical.add_state(MidAirState(atlas=self))
-        self.__state_machine_vertical.add_transition_group(
-            "idle",
-            TransitionGroup(
-                (self.__state_machine_vertical["jump-up"],
-                 lambda _, e: e.type == pygame.KEYDOWN and e.key == pygame.K_UP)
-            ))
-        self.__state_machine_vertical.add_transition_group(
-            "jump-up",
-            TransitionGroup(
-                (self.__state_machine_vertical["mid-air"], lambda _, e: True)
-            ))
-        self.__state_machine_vertical.add_transition_group(
-            "mid-air",
-            TransitionGroup(
-                (self.__state_machine_vertical["idle"],
-                 lambda _, e: e.type == CustomEventTypes.EVENT_LEVEL_1_COLLIDE_FLOOR)
-            ))
-        self.__state_machine_vertical.start_state = "idle"
+        self.__state_machine_vertical = StateMachine(PickleAtlasGravity.VERTICAL_STATE_MACHINE_TEMPLATE, atlas=self)
         self.__state_machine_vertical.reset()
 
         self.acceleration_y = PickleAtlasGravity.G
@@ -163,6 +182,10 @@ class PickleAtlasGravity(Atlas):
             self.__hp -= damage
             self.__invincible.start()
 
+    @property
+    def bullet_pool(self) -> AtlasPool[BulletAtlas]:
+        return self.__bullet_pool
+
     @property
     def hp(self):
         return self.__hp
@@ -172,7 +195,7 @@ class PickleAtlasGravity(Atlas):
         self.__hp = val
 
     def fire(self):
-        bullet = BulletAtlas(AssetObjectFactory().new_asset_object("asset.sprite.pickle-projectile"))
+        bullet = self.__bullet_pool.acquire()
         bullet.scale = (0.02, 0.02)
         fire_vec = (0, 0)
         r_side_offset = pygame.Vector2(self.surface.get_size())
@@ -15,9 +15,21 @@ from util import util
 
 
 class GameLost(Scene):
+    MANIFEST = (
+        "asset.sprite.menu.background",
+        "asset.sprite.game-lost",
+        "asset.sprite.retry",
+        "asset.sprite.back-to-menu",
+        "asset.sprite.menu.cursor",
+    )
+    DIRTY_RECT_RENDERING = True
+
     def __init__(self, size: typing.Tuple[int, int], retry_scene: typing.Optional[typing.Type[Scene]]):
         super().__init__(size)
         self.__retry_scene = retry_scene
+        if retry_scene:
+            retry_scene.request_preload()
+        Menu.Menu.request_preload()
 
         self.background = Atlas(AssetObjectFactory().new_asset_object("asset.sprite.menu.background"))
         self.background.scale_to(size)
@@ -14,9 +14,20 @@ from util import util
 
 
 class GameWin(Scene):
+    MANIFEST = (
+        "asset.sprite.menu.background",
+        "asset.sprite.game-win",
+        "asset.sprite.next-level",
+        "asset.sprite.menu.cursor",
+        "asset.sprite.senior-pickle",
+    )
+    DIRTY_RECT_RENDERING = True
+
     def __init__(self, size: typing.Tuple[int, int], next_level_scene: typing.Optional[typing.Type[Scene]]):
         super().__init__(size)
         self.__next_level_scene = next_level_scene
+        if next_level_scene:
+            next_level_scene.request_preload()
 
         self.background = Atlas(AssetObjectFactory().new_asset_object("asset.sprite.menu.background"))
         self.background.scale_to(size)
@@ -15,8 +15,16 @@ from util import util
 
 
 class Help(Scene):
+    MANIFEST = (
+        "asset.sprite.menu.background",
+        "asset.text.help.back-hint",
+        "asset.sprite.help-manual",
+    )
+    DIRTY_RECT_RENDERING = True
+
     def __init__(self, size: typing.Tuple[int, int]):
         super().__init__(size)
+        Menu.Menu.request_preload()
 
         asset_object_factory = AssetObjectFactory()
 
@@ -7,6 +7,7 @@ from asset.AssetObjectFactory import AssetObjectFactory
 from core.object_model.Layer import Layer
 from core.object_model.Map import Map
 from core.object_model.Scene import Scene
+from core.physics.SpatialHash import SpatialHash
 from event.CustomEventTypes import CustomEventTypes
 from game.atlas.BacteriaAtlas import BacteriaAtlas
 from game.atlas.MapAtlas import MapAtlas
@@ -15,12 +16,27 @@ from game.scene.GameLost import GameLost
 from game.scene.GameWin import GameWin
 from game.scene.Level1 import Level1
 from util import util
+from util.FrameProfiler import FrameProfiler
 from util.MapNavigator import MapNavigator
 
 
 class Level0Plus(Scene):
+    MANIFEST = (
+        "asset.sprite.level.0.plus.background",
+        "asset.sprite.level.0.tile.soil",
+        "asset.sprite.level.0.tile.wall",
+        "asset.sprite.level.0.tile.exit",
+        "asset.sprite.level.0.tile.spawn",
+        "asset.sprite.pickle.0",
+        "asset.sprite.pickle.1",
+        "asset.sprite.pickle.2",
+        "asset.sprite.bacteria",
+    )
+
     def __init__(self, size: typing.Tuple[int, int]):
         super().__init__(size)
+        GameWin.request_preload()
+        GameLost.request_preload()
 
         self.background["background"] = AssetObjectFactory().new_asset_object("asset.sprite.level.0.plus.background")
 
@@ -35,7 +51,7 @@ class Level0Plus(Scene):
             MapAtlas(AssetObjectFactory().new_asset_object("asset.map.random", tile_count=(17, 23)), texture_dict)
         self.__map_atlas.position = util.center(
             size,
-            self.__map_atlas[self.__map_atlas.current_sprite_key].surface.get_size()
+            self.__map_atlas.size
         )
         map_layer = Layer(self.__map_atlas)
 
@@ -65,30 +81,38 @@ class Level0Plus(Scene):
         self.layer_manager["map"] = map_layer
         self.layer_manager["entity"] = entity_layer
 
+        self.__spatial_hash = SpatialHash()
+
     def update(self):
         pickle_position = self.__pickle_atlas.position
         super().update()
 
-        collide_bacteria = any([self.__pickle_atlas.collides_atlas(bacteria_atlas)
-                                for (bacteria_atlas, _) in self.__bacteria_atlas_position])
+        self.bacteria_collide()
+        if self.wall_collide(pickle_position):
+            return
+        self.exit_collide()
+
+    @FrameProfiler.timed("Level0Plus.bacteria_collide")
+    def bacteria_collide(self):
+        self.__spatial_hash.clear()
+        self.__spatial_hash.insert(*[bacteria_atlas for (bacteria_atlas, _) in self.__bacteria_atlas_position])
+        collide_bacteria = next(self.__spatial_hash.collisions(self.__pickle_atlas), None) is not None
         if collide_bacteria:
             event = pygame.event.Event(CustomEventTypes.EVENT_STAGE_CHANGE_SCENE_REQUEST)
             event.scene = GameLost(self.size, self.__class__)
             pygame.event.post(event)
 
-        collide_wall = self.__pickle_atlas.collides_mask(
-            self.__map_atlas.wall_mask,
-            pygame.Vector2(self.__map_atlas.position) - pygame.Vector2(self.__pickle_atlas.position)
-        )
+    @FrameProfiler.timed("Level0Plus.wall_collide")
+    def wall_collide(self, pickle_position: typing.Tuple[float, float]) -> bool:
+        collide_wall = self.__map_atlas.collides_tile_type(self.__pickle_atlas, Map.TileType.WALL)
         if collide_wall:
             self.__pickle_atlas.speed = (0, 0)
             self.__pickle_atlas.position = pickle_position
-            return
+        return bool(collide_wall)
 
-        collide_exit = self.__pickle_atlas.collides_mask(
-            self.__map_atlas.exit_mask,
-            pygame.Vector2(self.__map_atlas.position) - pygame.Vector2(self.__pickle_atlas.position)
-        )
+    @FrameProfiler.timed("Level0Plus.exit_collide")
+    def exit_collide(self):
+        collide_exit = self.__map_atlas.collides_tile_type(self.__pickle_atlas, Map.TileType.EXIT)
         if collide_exit:
             event = pygame.event.Event(CustomEventTypes.EVENT_STAGE_CHANGE_SCENE_REQUEST)
             event.scene = GameWin(self.size, Level1)
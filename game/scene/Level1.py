@@ -18,11 +18,27 @@ from game.atlas.PickleAtlasGravity import PickleAtlasGravity
 from game.scene.GameLost import GameLost
 from game.scene.GameWin import GameWin
 from game.scene.Level2 import Level2
+from util.FrameProfiler import FrameProfiler
 
 
 class Level1(Scene):
+    MANIFEST = (
+        "asset.sprite.level.1.tile.grass",
+        "asset.sprite.level.1.tile.water",
+        "asset.sprite.level.1.background",
+        "asset.map.level.1",
+        "asset.sprite.level.1.tower",
+        "asset.sprite.level.1.tree",
+        "asset.sprite.pickle.0",
+        "asset.sprite.pickle.1",
+        "asset.sprite.pickle.2",
+        "asset.sprite.pickle-projectile",
+    )
+
     def __init__(self, size: typing.Tuple[int, int]):
         super().__init__(size)
+        GameWin.request_preload()
+        GameLost.request_preload()
 
         config_manager = ConfigManager()
         self.__is_show_collide_body = config_manager.get("config.debug")
@@ -46,11 +62,10 @@ class Level1(Scene):
         self.__pickle_atlas.position = self.__map_atlas.grid_to_screen_position(
             pygame.Vector2(8, 10), self.__pickle_atlas.surface.get_size()
         )
-        self.__pickle_atlas.RECT_MASK = True
         self.__pickle_atlas.SHOW_COLLIDE_BODY = self.__is_show_collide_body
 
         self.__camera = Camera((1280, 720), self.__pickle_atlas,
-                               self.__map_atlas.surface.get_size())
+                               self.__map_atlas.size)
         self.__collide_mask_surface = None
 
         entity_layer = Layer(self.__pickle_atlas)
@@ -58,9 +73,6 @@ class Level1(Scene):
         self.layer_manager["scenery"] = self.init_scenery_layer()
         self.layer_manager["entity"] = entity_layer
 
-        self.__scene_canvas = pygame.Surface(self.__map_atlas.surface.get_size(),
-                                             pygame.SRCALPHA).convert_alpha()
-
         self.__sent_floor_collision_event = False
 
     def init_scenery_layer(self):
@@ -82,6 +94,9 @@ class Level1(Scene):
         tree2 = Atlas(tree_sp)
         tree2.position = self.__map_atlas.grid_to_screen_position(pygame.Vector2(9, 21),
                                                                   tree2.surface.get_size())
+        # Scenery is only drawn
+        for scenery in (tower, tree1, tree2):
+            scenery.COLLIDABLE = False
         return Layer(tower, tree1, tree2)
 
     def update(self):
@@ -91,10 +106,12 @@ class Level1(Scene):
         super().update()
         self.__pickle_atlas.update()
 
-        collide_mask = self.__pickle_atlas.mask.overlap_mask(
-            self.__map_atlas.wall_mask,
-            pygame.Vector2(self.__map_atlas.position) - pygame.Vector2(self.__pickle_atlas.position)
-        )
+        self.wall_collide(backup_pos_x, backup_pos_y)
+        self.tile_collide()
+
+    @FrameProfiler.timed("Level1.wall_collide")
+    def wall_collide(self, backup_pos_x: float, backup_pos_y: float):
+        collide_mask = self.__map_atlas.overlap_mask_tile_type(self.__pickle_atlas, Map.TileType.WALL)
         if collide_mask.count():
             x, y = collide_mask.centroid()
 
@@ -120,27 +137,20 @@ class Level1(Scene):
         else:
             self.__sent_floor_collision_event = False
 
-        collide_exit = self.__pickle_atlas.collides_mask(
-            self.__map_atlas.exit_mask,
-            pygame.Vector2(self.__map_atlas.position) - pygame.Vector2(self.__pickle_atlas.position)
-        )
+    @FrameProfiler.timed("Level1.tile_collide")
+    def tile_collide(self):
+        collide_exit = self.__map_atlas.collides_tile_type(self.__pickle_atlas, Map.TileType.EXIT)
         if collide_exit:
             event = pygame.event.Event(CustomEventTypes.EVENT_STAGE_CHANGE_SCENE_REQUEST)
             event.scene = GameWin(self.size, Level2)
             pygame.event.post(event)
 
-        collide_dead = self.__pickle_atlas.collides_mask(
-            self.__map_atlas.dead_mask,
-            pygame.Vector2(self.__map_atlas.position) - pygame.Vector2(self.__pickle_atlas.position)
-        )
+        collide_dead = self.__map_atlas.collides_tile_type(self.__pickle_atlas, Map.TileType.DEAD)
         if collide_dead:
             event = pygame.event.Event(CustomEventTypes.EVENT_STAGE_CHANGE_SCENE_REQUEST)
             event.scene = GameLost(self.size, self.__class__)
             pygame.event.post(event)
 
-    def render(self, surface: pygame.surface.Surface):
+    def render(self, surface: pygame.surface.Surface, interpolation: float = 1.0):
         surface.blit(self.background.surface, (0, 0))
-        render_params = self.__camera.get_render_params()
-        self.__scene_canvas.fill((0, 0, 0, 0))
-        self.layer_manager.render(self.__scene_canvas)
-        surface.blit(self.__scene_canvas, (0, 0), render_params)
+        self.layer_manager.render(surface, self.__camera.get_view_rect(interpolation), interpolation)
@@ -8,10 +8,12 @@ from asset.AssetObjectFactory import AssetObjectFactory
 from config.ConfigManager import ConfigManager
 from core.object_model.Atlas import Atlas
 from core.object_model.Camera import Camera
+from core.object_model.EntityStore import EntityStore
 from core.object_model.Layer import Layer
 from core.object_model.Map import Map
 from core.object_model.Scene import Scene
 from core.object_model.Sprite import Sprite
+from core.physics.SpatialHash import SpatialHash
 from event.CustomEventTypes import CustomEventTypes
 from game.atlas.BacteriaAtlasGravity import BacteriaAtlasGravity
 from game.atlas.BossAtlas import BossAtlas
@@ -20,11 +22,30 @@ from game.atlas.MapAtlas import MapAtlas
 from game.atlas.PickleAtlasGravity import PickleAtlasGravity
 from game.scene.GameLost import GameLost
 from game.scene.GameWin import GameWin
+from util.FrameProfiler import FrameProfiler
 
 
 class Level2(Scene):
+    MANIFEST = (
+        "asset.sprite.level.1.tile.grass",
+        "asset.sprite.level.1.tile.water",
+        "asset.sprite.heart",
+        "asset.sprite.level.1.background",
+        "asset.map.level.2",
+        "asset.sprite.level.1.tree",
+        "asset.sprite.pickle.0",
+        "asset.sprite.pickle.1",
+        "asset.sprite.pickle.2",
+        "asset.sprite.pickle-projectile",
+        "asset.sprite.boss",
+        "asset.sprite.boss-projectile",
+        "asset.sprite.bacteria",
+    )
+
     def __init__(self, size: typing.Tuple[int, int]):
         super().__init__(size)
+        GameWin.request_preload()
+        GameLost.request_preload()
 
         config_manager = ConfigManager()
         self.__is_show_collide_body = config_manager.get("config.debug")
@@ -47,8 +68,9 @@ class Level2(Scene):
 
         # setting dynamically spawned entities' layer
         self.__enemy_layer = Layer()
-        self.__bullets_layer = Layer()
-        self.__enemy_bullets_layer = Layer()
+        # Bullets are integrated in bulk when NumPy is available
+        self.__bullets_layer = Layer(entity_store=EntityStore.create())
+        self.__enemy_bullets_layer = Layer(entity_store=EntityStore.create())
 
         self.__spawned_store = {"enemies": [], "bullets": [], "enemy_bullets": []}
         self.__enemy_layer.set_atlas_list(self.__spawned_store["enemies"])
@@ -68,11 +90,10 @@ class Level2(Scene):
         self.__pickle_atlas.position = self.__map_atlas.grid_to_screen_position(
             pygame.Vector2(8, 10), self.__pickle_atlas.surface.get_size()
         )
-        self.__pickle_atlas.RECT_MASK = True
         self.__pickle_atlas.SHOW_COLLIDE_BODY = self.__is_show_collide_body
 
         self.__camera = Camera((1280, 720), self.__pickle_atlas,
-                               self.__map_atlas.surface.get_size())
+                               self.__map_atlas.size)
         self.__collide_mask_surface = None
 
         self.__level_boss = BossAtlas(self.__spawned_store["enemies"],
@@ -90,8 +111,7 @@ class Level2(Scene):
         self.layer_manager["bullet"] = self.__bullets_layer
         self.layer_manager["enemy_bullet"] = self.__enemy_bullets_layer
 
-        self.__scene_canvas = pygame.Surface(self.__map_atlas.surface.get_size(),
-                                             pygame.SRCALPHA).convert_alpha()
+        self.__target_spatial_hash = SpatialHash()
 
         self.__sent_floor_collision_event = False
 
@@ -107,61 +127,57 @@ class Level2(Scene):
         tree2 = Atlas(tree_sp)
         tree2.position = self.__map_atlas.grid_to_screen_position(pygame.Vector2(9, 15),
                                                                   tree2.surface.get_size())
+        # Scenery is only drawn
+        for tree in (tree1, tree2):
+            tree.COLLIDABLE = False
         return Layer(tree1, tree2)
 
+    @FrameProfiler.timed("Level2.garbage_collect")
     def garbage_collect(self):
-        map_size = self.__map_atlas.surface.get_size()
-        for bullet in self.__spawned_store["bullets"]:
-            bullet: BulletAtlas
-            if bullet.position_x > map_size[0] or \
-                    bullet.position_x < 0 or \
-                    bullet.position_y > map_size[1] or \
-                    bullet.position_y < 0:
-                self.__spawned_store["bullets"].remove(bullet)
+        map_size = self.__map_atlas.size
+        for (bullets, layer) in ((self.__spawned_store["bullets"], self.__bullets_layer),
+                                 (self.__spawned_store["enemy_bullets"], self.__enemy_bullets_layer)):
+            for bullet in bullets:
+                bullet: BulletAtlas
+                if bullet.position_x > map_size[0] or \
+                        bullet.position_x < 0 or \
+                        bullet.position_y > map_size[1] or \
+                        bullet.position_y < 0:
+                    layer.despawn(bullet)
 
         for bc in self.__spawned_store["enemies"]:
             bc: BacteriaAtlasGravity
             if bc.hp <= 0:
-                self.__spawned_store["enemies"].remove(bc)
+                self.__enemy_layer.despawn(bc)
 
+    @FrameProfiler.timed("Level2.bullet_collide")
     def bullet_collide(self):
+        # Bullets only run the mask test against the enemies sharing their broadphase cells
+        self.__target_spatial_hash.clear()
+        self.__target_spatial_hash.insert_layer(self.__enemy_layer)
+        self.__target_spatial_hash.insert(self.__level_boss)
+
         for bullet in self.__spawned_store["bullets"]:
             bullet: BulletAtlas
 
-            # collide with bacteria
-            for bc in self.__spawned_store["enemies"]:
-                bc: BacteriaAtlasGravity
-
-                is_collide = bc.mask.overlap(
-                    bullet.mask, pygame.Vector2(bullet.position) - pygame.Vector2(bc.position))
-                if is_collide:
-                    bc.hp -= bullet.damage
-                    self.__spawned_store["bullets"].remove(bullet)
-                    break
-
-            # collide with level boss
-            is_collide = bullet.mask.overlap(self.__level_boss.mask,
-                                             pygame.Vector2(
-                                                 self.__level_boss.position) - pygame.Vector2(
-                                                 bullet.position))
-            if is_collide:
-                self.__level_boss.hp -= bullet.damage
-                self.__spawned_store["bullets"].remove(bullet)
+            for target, _ in self.__target_spatial_hash.collisions(bullet):
+                target: BacteriaAtlasGravity | BossAtlas
+                target.hp -= bullet.damage
+                self.__bullets_layer.despawn(bullet)
+                break
 
+    @FrameProfiler.timed("Level2.enemy_bullet_collide")
     def enemy_bullet_collide(self):
         for bullet in self.__spawned_store["enemy_bullets"]:
             bullet: BulletAtlas
 
-            is_collide = bullet.mask.overlap(
-                self.__pickle_atlas.mask,
-                pygame.Vector2(self.__pickle_atlas.position) - pygame.Vector2(
-                    bullet.position)
-            )
+            is_collide = bullet.collides_atlas(self.__pickle_atlas)
 
             if is_collide:
                 self.__pickle_atlas.hit(bullet.damage)
-                self.__spawned_store["enemy_bullets"].remove(bullet)
+                self.__enemy_bullets_layer.despawn(bullet)
 
+    @FrameProfiler.timed("Level2.enemy_collide")
     def enemy_collide(self):
         for bc in self.__spawned_store["enemies"]:
             bc: BacteriaAtlasGravity
@@ -172,11 +188,7 @@ class Level2(Scene):
 
                 bc.update()
 
-                is_collide_wall = bc.mask.overlap(
-                    self.__map_atlas.wall_mask,
-                    pygame.Vector2(self.__map_atlas.position) - pygame.Vector2(
-                        bc.position)
-                )
+                is_collide_wall = self.__map_atlas.collides_tile_type(bc, Map.TileType.WALL)
 
                 if is_collide_wall:
                     bc.first_touch_ground = True
@@ -185,6 +197,7 @@ class Level2(Scene):
                     bc.position_x = backup_pos_x
                     bc.position_y = backup_pos_y
 
+    @FrameProfiler.timed("Level2.pickle_collide")
     def pickle_collide(self):
         backup_pos = self.__pickle_atlas.position
         backup_pos_x, backup_pos_y = backup_pos
@@ -193,10 +206,7 @@ class Level2(Scene):
         self.__pickle_atlas.update()
 
         # collide with wall
-        collide_mask = self.__pickle_atlas.mask.overlap_mask(
-            self.__map_atlas.wall_mask,
-            pygame.Vector2(self.__map_atlas.position) - pygame.Vector2(self.__pickle_atlas.position)
-        )
+        collide_mask = self.__map_atlas.overlap_mask_tile_type(self.__pickle_atlas, Map.TileType.WALL)
         if collide_mask.count():
             x, y = collide_mask.centroid()
 
@@ -223,11 +233,7 @@ class Level2(Scene):
         else:
             self.__sent_floor_collision_event = False
 
-        collide_dead = self.__pickle_atlas.collides_mask(
-            self.__map_atlas.dead_mask,
-            pygame.Vector2(self.__map_atlas.position) - pygame.Vector2(
-                self.__pickle_atlas.position)
-        )
+        collide_dead = self.__map_atlas.collides_tile_type(self.__pickle_atlas, Map.TileType.DEAD)
         if collide_dead:
             event = pygame.event.Event(CustomEventTypes.EVENT_STAGE_CHANGE_SCENE_REQUEST)
             event.scene = GameLost(self.size, self.__class__)
@@ -237,11 +243,7 @@ class Level2(Scene):
         for bc in self.__spawned_store["enemies"]:
             bc: BacteriaAtlasGravity
 
-            is_collide = self.__pickle_atlas.mask.overlap(
-                bc.mask,
-                pygame.Vector2(bc.position) - pygame.Vector2(
-                    self.__pickle_atlas.position)
-            )
+            is_collide = self.__pickle_atlas.collides_atlas(bc)
 
             if is_collide:
                 self.__pickle_atlas.hit(bc.damage)
@@ -252,6 +254,8 @@ class Level2(Scene):
         self.bullet_collide()
         self.enemy_bullet_collide()
         self.garbage_collect()
+        # Everything despawned this frame leaves the spawned stores in one pass
+        self.layer_manager.compact()
 
         if self.__level_boss.hp <= 0:
             event = pygame.event.Event(CustomEventTypes.EVENT_STAGE_CHANGE_SCENE_REQUEST)
@@ -270,10 +274,7 @@ class Level2(Scene):
         for i in range(hp):
             surface.blit(heart_img, (offset * i, 0))
 
-    def render(self, surface: pygame.surface.Surface):
+    def render(self, surface: pygame.surface.Surface, interpolation: float = 1.0):
         surface.blit(self.background.surface, (0, 0))
-        render_params = self.__camera.get_render_params()
-        self.__scene_canvas.fill((0, 0, 0, 0))
-        self.layer_manager.render(self.__scene_canvas)
-        surface.blit(self.__scene_canvas, (0, 0), render_params)
+        self.layer_manager.render(surface, self.__camera.get_view_rect(interpolation), interpolation)
         self.render_ui(surface)
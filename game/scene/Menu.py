@@ -16,8 +16,20 @@ from util import util
 
 
 class Menu(Scene):
+    MANIFEST = (
+        "asset.sprite.menu.background",
+        "asset.sprite.menu.logo",
+        "asset.sprite.menu.start",
+        "asset.sprite.menu.help",
+        "asset.sprite.menu.exit",
+        "asset.sprite.menu.cursor",
+    )
+    DIRTY_RECT_RENDERING = True
+
     def __init__(self, size: typing.Tuple[int, int]):
         super().__init__(size)
+        Level0.request_preload()
+        Help.request_preload()
 
         asset_object_factory = AssetObjectFactory()
 
@@ -8,6 +8,8 @@ from core.object_model.Sprite import Sprite
 
 
 class TileSprite(Sprite):
+    __slots__ = ()
+
     def __init__(self, tile_type: Map.TileType, tile_size: int, sprite: typing.Optional[Sprite] = None):
         surface = pygame.surface.Surface((tile_size, tile_size), pygame.SRCALPHA).convert_alpha()
         if sprite is not None:
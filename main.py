@@ -1,19 +1,31 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+import argparse
+import importlib
 import logging
+import time
+import typing
 
 import pygame
 
+from asset.AssetLoaderThread import AssetLoaderThread
 from config.ConfigManager import ConfigManager
 from config.ConfigMonitorThread import ConfigMonitorThread
 from core.object_model.Stage import Stage
 from event.CustomEventTypes import CustomEventTypes
 from event.EventDispatcher import EventDispatcher
 from event.EventHandler import EventHandler
+from event.EventRecorder import EventRecorder
+from event.EventReplayer import EventReplayer
 from game.scene.Menu import Menu
+from util.FrameProfiler import FrameProfiler
 from util.FrameRateStabilizer import FrameRateStabilizer
+from util.HeadlessRunner import HeadlessRunner
+from util.ProfilerOverlay import ProfilerOverlay
 
 _running = True
+# Scenes in game.scene that can be built from the display size alone, and so can be started from the command line
+STARTING_SCENES = ("Menu", "Help", "Level0", "Level0Plus", "Level1", "Level2")
 
 
 def stop(logger: logging.Logger):
@@ -22,12 +34,100 @@ def stop(logger: logging.Logger):
     _running = False
 
 
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Pickle Rush")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without a window or frame pacing and report ticks per second")
+    parser.add_argument("--frames", type=int, default=None,
+                        help="number of ticks to run in headless mode, 600 or the length of the replay by default")
+    parser.add_argument("--scene", default=Menu.__name__, choices=STARTING_SCENES,
+                        help="name of the starting scene in game.scene, e.g. Level2")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for the random generator when recording")
+    recording_group = parser.add_mutually_exclusive_group()
+    recording_group.add_argument("--record", metavar="FILE",
+                                 help="record input per simulation step to FILE")
+    recording_group.add_argument("--replay", metavar="FILE",
+                                 help="replay input recorded to FILE; implies --headless")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="time the frame scopes from the start and dump the last frames to FILE on exit")
+    return parser.parse_args()
+
+
+def handle_profiler_key(event: pygame.event.Event, stage: Stage, profiler_overlay: ProfilerOverlay):
+    if event.key == pygame.K_F3:
+        profiler_overlay.toggle()
+        stage.scene.invalidate()
+    elif event.key == pygame.K_F4:
+        FrameProfiler().dump(time.strftime("profile-%Y%m%d-%H%M%S.json"))
+
+
+def run(stage: Stage, event_dispatcher: EventDispatcher, config_manager: ConfigManager,
+        frame_rate_stabilizer: FrameRateStabilizer, logger: logging.Logger, profiler_overlay: ProfilerOverlay,
+        event_recorder: typing.Optional[EventRecorder] = None):
+    # Physics is tuned in units per step, so the simulation advances in fixed steps whatever the frame rate
+    simulation_step = 1 / config_manager.get("config.game.simulationRate")
+    max_steps_per_frame = config_manager.get("config.game.maxStepsPerFrame")
+    accumulator = 0.0
+    step_count = 0
+    previous_time = time.perf_counter()
+    profiler = FrameProfiler()
+
+    while _running:
+        profiler.begin_frame()
+        current_time = time.perf_counter()
+        accumulator += current_time - previous_time
+        previous_time = current_time
+
+        steps = 0
+        while accumulator >= simulation_step and steps < max_steps_per_frame:
+            # Events are handled once per step, as replays do, so that a recording plays back step for step.
+            # Input is stored against the step it precedes
+            events = pygame.event.get()
+            if event_recorder is not None:
+                event_recorder.record(step_count, events)
+            with profiler.scope("frame.dispatch"):
+                event_dispatcher.dispatch_all(events)
+
+            with profiler.scope("frame.update"):
+                stage.scene.snapshot()
+                stage.scene.update()
+            accumulator -= simulation_step
+            steps += 1
+            step_count += 1
+        if accumulator >= simulation_step:
+            # Too far behind to catch up; the game slows down instead of stalling on catch-up steps
+            logger.debug(f"Dropping {accumulator // simulation_step:.0f} simulation steps")
+            accumulator %= simulation_step
+
+        # Atlases are drawn between the previous and the current step
+        if profiler_overlay.visible:
+            # The overlay is drawn over the scene, which has to be redrawn whole underneath it
+            stage.scene.invalidate()
+        with profiler.scope("frame.render"):
+            dirty_rects = stage.scene.render(stage.surface, accumulator / simulation_step)
+        profiler_overlay.render(stage.surface)
+        with profiler.scope("frame.display"):
+            if dirty_rects is None:
+                pygame.display.update()
+            elif len(dirty_rects):
+                pygame.display.update(dirty_rects)
+        frame_rate_stabilizer.wait()
+
+
 def main():
-    # Logger setup
-    logging.basicConfig(level=logging.DEBUG,
+    arguments = parse_arguments()
+    if arguments.replay is not None:
+        arguments.headless = True
+
+    # Logger setup; per-event debug logging would dominate a headless measurement
+    logging.basicConfig(level=logging.INFO if arguments.headless else logging.DEBUG,
                         format="[%(asctime)s][%(levelname)s][%(name)s] %(message)s")
     logger = logging.getLogger()
 
+    if arguments.headless:
+        HeadlessRunner.use_dummy_drivers()
+
     logger.debug("Initializing pygame")
     pygame.init()
     pygame.display.set_caption("Pickle Rush")
@@ -44,13 +144,17 @@ def main():
     logger.debug("Initializing stage")
     stage = Stage(display_surface)
 
+    # Seeding has to precede the first scene, whose map may be generated randomly
+    event_recorder = EventRecorder(arguments.seed) if arguments.record is not None else None
+    event_replayer = EventReplayer(arguments.replay) if arguments.replay is not None else None
+
     logger.debug("Setting starting scene")
-    stage.scene = Menu(display_surface.get_size())
+    scene_type = getattr(importlib.import_module(f"game.scene.{arguments.scene}"), arguments.scene)
+    stage.scene = scene_type(display_surface.get_size())
 
     logger.debug("Initializing frame rate stabilizer")
     target_fps = config_manager.get("config.graphics.fps")
     frame_rate_stabilizer = FrameRateStabilizer(target_fps)
-    next(frame_rate_stabilizer.get_tick)
 
     logger.debug("Initializing event dispatcher")
     event_dispatcher = EventDispatcher()
@@ -60,29 +164,48 @@ def main():
                                            lambda e: stage.set_scene(e.scene)))
     event_dispatcher.register(pygame.KEYDOWN, "root",
                               EventHandler("key-down", lambda e: stage.accept_event(e)))
+    event_dispatcher.register(pygame.WINDOWEXPOSED, "root",
+                              EventHandler("window-exposed", lambda _: stage.scene.invalidate()))
     event_dispatcher.register(pygame.KEYUP, "root",
                               EventHandler("key-up", lambda e: stage.accept_event(e)))
 
-    logger.debug("Creating subsystem thread instances")
-    config_monitor_thread = ConfigMonitorThread(event_dispatcher, config_manager)
+    logger.debug("Initializing profiler")
+    FrameProfiler().enabled = arguments.profile is not None
+    # Uncapped frames are still measured against the budget of a simulation step
+    overlay_fps = target_fps if target_fps > 0 else config_manager.get("config.game.simulationRate")
+    profiler_overlay = ProfilerOverlay(overlay_fps, keep_profiling=arguments.profile is not None)
+    event_dispatcher.register(pygame.KEYDOWN, "root",
+                              EventHandler("profiler-key", lambda e: handle_profiler_key(e, stage, profiler_overlay)))
 
-    # Starting subsystem threads
-    threads = [
-        config_monitor_thread
-    ]
+    logger.debug("Creating subsystem thread instances")
+    # The loader blocks while idle, so it does not skew headless measurements. The config monitor polls its queue,
+    # and config files are not edited during a headless run, so it is only started in live runs
+    threads = [AssetLoaderThread(event_dispatcher)]
+    if not arguments.headless:
+        threads.append(ConfigMonitorThread(event_dispatcher, config_manager))
 
     for thread in threads:
         logger.debug(f"Starting {thread}")
         thread.start()
 
-    clock = pygame.time.Clock()
-    while _running:
-        event_dispatcher.dispatch_all(pygame.event.get())
-        stage.scene.update()
-        stage.scene.render(display_surface)
-        pygame.display.update()
-        tick = frame_rate_stabilizer.get_tick.send(clock.get_fps())
-        clock.tick(tick)
+    if arguments.headless:
+        frames = arguments.frames
+        if frames is None:
+            frames = event_replayer.frame_count if event_replayer is not None else 600
+        HeadlessRunner(stage, event_dispatcher, event_replayer).run(frames, lambda: _running)
+        # Subsystem threads quit on the quit event, which nobody posts without a window
+        event_dispatcher.dispatch_all([pygame.event.Event(pygame.QUIT)])
+    else:
+        run(stage, event_dispatcher, config_manager, frame_rate_stabilizer, logger, profiler_overlay,
+            event_recorder)
+        if event_recorder is not None:
+            event_recorder.save(arguments.record)
+        logger.info(f"Frame pacing: {frame_rate_stabilizer.fps:.1f} FPS, "
+                    f"jitter {frame_rate_stabilizer.jitter * 1000:.2f} ms, "
+                    f"max deviation {frame_rate_stabilizer.max_deviation * 1000:.2f} ms")
+
+    if arguments.profile is not None:
+        FrameProfiler().dump(arguments.profile)
 
     while len(threads):
         thread = threads.pop()
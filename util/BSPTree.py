@@ -76,7 +76,10 @@ class BSPTree:
             min_parent_width: int = 3,
             min_parent_height: int = 3,
             stop_threshold: float = 0.15,
-            split_bias: float = 0.35):
+            split_bias: float = 0.35,
+            rng: typing.Optional[random.Random] = None):
+        # The module functions share the generator that recorded sessions seed
+        rng = rng if rng is not None else random
 
         self.__root_node.left = None
         self.__root_node.right = None
@@ -84,7 +87,7 @@ class BSPTree:
         def recurse(parent_node: Node, parent_direction: bool, current_depth: int):
             if current_depth > max_depth:
                 return
-            if current_depth >= min_depth and random.random() < stop_threshold:
+            if current_depth >= min_depth and rng.random() < stop_threshold:
                 return
 
             (parent_width, parent_height) = parent_node.rect.size
@@ -98,7 +101,7 @@ class BSPTree:
                 split_vertical = not parent_direction
 
             if split_vertical:
-                split_offset = round(random.uniform(split_bias, 1 - split_bias) * parent_width)
+                split_offset = round(rng.uniform(split_bias, 1 - split_bias) * parent_width)
                 parent_node.left = Node(
                     pygame.Rect(parent_node.rect.x, parent_node.rect.y,
                                 split_offset, parent_height),
@@ -109,7 +112,7 @@ class BSPTree:
                     None, None
                 )
             else:
-                split_offset = round(random.uniform(split_bias, 1 - split_bias) * parent_height)
+                split_offset = round(rng.uniform(split_bias, 1 - split_bias) * parent_height)
                 parent_node.left = Node(
                     pygame.Rect(parent_node.rect.x, parent_node.rect.y,
                                 parent_width, split_offset),
@@ -124,7 +127,7 @@ class BSPTree:
             recurse(parent_node.left, split_vertical, current_depth + 1)
             recurse(parent_node.right, split_vertical, current_depth + 1)
 
-        recurse(self.__root_node, random.random() < 0.5, 1)
+        recurse(self.__root_node, rng.random() < 0.5, 1)
 
     def dfs_preorder_iterator(self) -> typing.Optional[typing.Iterator[Node]]:
         stack = []
@@ -139,7 +142,8 @@ class BSPTree:
                 current = stack.pop()
                 current = current.right
 
-    def generate_rooms(self, min_width: int = 1, min_height: int = 1):
+    def generate_rooms(self, min_width: int = 1, min_height: int = 1, rng: typing.Optional[random.Random] = None):
+        rng = rng if rng is not None else random
         (root_x, root_y, root_width, root_height) = (self.__root_node.rect.x, self.__root_node.rect.y,
                                                      self.__root_node.rect.width, self.__root_node.rect.height)
         for node in self.dfs_preorder_iterator():
@@ -151,10 +155,10 @@ class BSPTree:
             if width < min_width or height < min_height:
                 continue
 
-            room_width = random.randint(min_width, width)
-            room_height = random.randint(min_height, height)
-            room_x = random.randint(x, x + width - room_width)
-            room_y = random.randint(y, y + height - room_height)
+            room_width = rng.randint(min_width, width)
+            room_height = rng.randint(min_height, height)
+            room_x = rng.randint(x, x + width - room_width)
+            room_y = rng.randint(y, y + height - room_height)
 
             node.room_rect = pygame.Rect(x, y, room_width, room_height)
 
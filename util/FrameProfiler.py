@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import collections
+import contextlib
+import functools
+import json
+import logging
+import time
+import typing
+
+ScopeTimesType: typing.TypeAlias = typing.Dict[str, float]
+
+
+class FrameProfiler:
+    """
+    Collects the time spent in named scopes per frame, keeping the last `HISTORY_SIZE` frames in a ring buffer.
+
+    Scopes are entered with `with FrameProfiler().scope(name)` or wrapped around methods with `FrameProfiler.timed`.
+    Times are inclusive, so nested scopes are also counted in their parents, and a scope entered several times in a
+    frame (e.g. once per simulation step) adds up. While disabled, scopes do not read the clock at all.
+    """
+    HISTORY_SIZE = 600
+
+    __instance = None
+
+    class Frame(typing.NamedTuple):
+        frame_time: float
+        scope_times: ScopeTimesType
+
+    class Scope:
+        __slots__ = ("__scope_times", "__name", "__start_time")
+
+        def __init__(self, scope_times: ScopeTimesType, name: str):
+            self.__scope_times = scope_times
+            self.__name = name
+            self.__start_time = 0.0
+
+        def __enter__(self):
+            self.__start_time = time.perf_counter()
+
+        def __exit__(self, *_):
+            elapsed = time.perf_counter() - self.__start_time
+            self.__scope_times[self.__name] = self.__scope_times.get(self.__name, 0.0) + elapsed
+
+    @staticmethod
+    def timed(name: str):
+        def decorator(f: typing.Callable):
+            profiler = FrameProfiler()
+
+            @functools.wraps(f)
+            def wrapper(*args, **kwargs):
+                if not profiler.enabled:
+                    return f(*args, **kwargs)
+                with profiler.scope(name):
+                    return f(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def __new__(cls, *args, **kwargs):
+        def init(instance):
+            instance.__logger = logging.getLogger(instance.__class__.__name__)
+            instance.enabled = False
+            instance.__history: typing.Deque[FrameProfiler.Frame] = \
+                collections.deque(maxlen=FrameProfiler.HISTORY_SIZE)
+            instance.__scope_times: ScopeTimesType = {}
+            instance.__frame_start_time: typing.Optional[float] = None
+            instance.__null_scope = contextlib.nullcontext()
+
+        if cls.__instance is None:
+            cls.__instance = super(FrameProfiler, cls).__new__(cls)
+            init(cls.__instance)
+
+        return cls.__instance
+
+    @property
+    def history(self) -> typing.Deque[FrameProfiler.Frame]:
+        return self.__history
+
+    def scope(self, name: str) -> typing.ContextManager:
+        if not self.enabled:
+            return self.__null_scope
+        return FrameProfiler.Scope(self.__scope_times, name)
+
+    def begin_frame(self):
+        # Frames are measured from one beginning to the next, so that pacing and presenting are included
+        if not self.enabled:
+            self.__frame_start_time = None
+            return
+
+        current_time = time.perf_counter()
+        if self.__frame_start_time is not None:
+            self.__history.append(FrameProfiler.Frame(current_time - self.__frame_start_time, self.__scope_times))
+        self.__frame_start_time = current_time
+        self.__scope_times = {}
+
+    def average_scope_times(self, frame_count: int) -> ScopeTimesType:
+        frames = list(self.__history)[-frame_count:]
+        averages: ScopeTimesType = {}
+        for frame in frames:
+            for (name, elapsed) in frame.scope_times.items():
+                averages[name] = averages.get(name, 0.0) + elapsed / len(frames)
+        return averages
+
+    def clear(self):
+        self.__history.clear()
+        self.__scope_times = {}
+        self.__frame_start_time = None
+
+    def dump(self, file_path: str):
+        with open(file_path, "w") as f:
+            json.dump({"frames": [{"frameTime": frame.frame_time, "scopes": frame.scope_times}
+                                  for frame in self.__history]}, f)
+        self.__logger.info(f"Dumped {len(self.__history)} frames to {file_path}")
@@ -1,19 +1,116 @@
 # -*- coding: utf-8 -*-
+import collections
+import statistics
+import time
+import typing
 
 
 class FrameRateStabilizer:
-    def __init__(self, target_fps: int = 60, sample_size: int = 30):
-        self.__target_fps = target_fps
-        self.__sample_size = sample_size
+    """
+    Paces frames to `target_fps` by waiting out whatever the work of a frame left of its budget.
 
-        self.get_tick = self.get_tick()
+    `wait` is called once per frame, after presenting. Frames are scheduled against deadlines one budget apart, so
+    that waiting does not drift; a frame that overruns its deadline starts a new schedule instead of rushing the
+    following ones. The OS sleeps until a spin threshold before the deadline, and the rest is spun, since sleeps
+    overshoot. The threshold follows the measured overshoot: it rises to the largest one seen and decays back towards
+    `SPIN_THRESHOLD` by `SPIN_THRESHOLD_DECAY` per frame, never exceeding `MAX_SPIN_THRESHOLD`. A `target_fps` of 0
+    leaves frames uncapped.
 
-        self.__average = self.__target_fps
+    Frame times of the last `sample_size` frames are kept for the jitter statistics.
+    """
+    SPIN_THRESHOLD = 0.0005
+    MAX_SPIN_THRESHOLD = 0.002
+    SPIN_THRESHOLD_DECAY = 0.9
 
-    def get_tick(self):
-        while True:
-            fps = yield self.calculate_tick(self.__average)
-            self.__average += (fps - self.__target_fps) / self.__sample_size
+    def __init__(self, target_fps: int = 60, sample_size: int = 120):
+        self.__frame_budget = 0.0
+        self.target_fps = target_fps
 
-    def calculate_tick(self, average: float):
-        return 2 * self.__target_fps - average
+        self.__deadline: typing.Optional[float] = None
+        self.__frame_start_time: typing.Optional[float] = None
+        self.__work_time = 0.0
+        self.__spin_threshold = FrameRateStabilizer.SPIN_THRESHOLD
+        self.__frame_times: typing.Deque[float] = collections.deque(maxlen=sample_size)
+
+    @property
+    def target_fps(self) -> int:
+        return round(1 / self.__frame_budget) if self.__frame_budget > 0 else 0
+
+    @target_fps.setter
+    def target_fps(self, value: int):
+        self.__frame_budget = 1 / value if value > 0 else 0.0
+        self.__deadline = None
+
+    @property
+    def uncapped(self) -> bool:
+        return self.__frame_budget == 0
+
+    @property
+    def frame_budget(self) -> float:
+        return self.__frame_budget
+
+    @property
+    def work_time(self) -> float:
+        # Time spent between the end of the previous wait and the start of the last one
+        return self.__work_time
+
+    @property
+    def spin_threshold(self) -> float:
+        return self.__spin_threshold
+
+    @property
+    def frame_times(self) -> typing.Deque[float]:
+        return self.__frame_times
+
+    @property
+    def average_frame_time(self) -> float:
+        return statistics.fmean(self.__frame_times) if len(self.__frame_times) else 0.0
+
+    @property
+    def jitter(self) -> float:
+        # Standard deviation of the frame time
+        return statistics.pstdev(self.__frame_times) if len(self.__frame_times) > 1 else 0.0
+
+    @property
+    def max_deviation(self) -> float:
+        if self.uncapped or not len(self.__frame_times):
+            return 0.0
+        return max(abs(frame_time - self.__frame_budget) for frame_time in self.__frame_times)
+
+    @property
+    def fps(self) -> float:
+        average_frame_time = self.average_frame_time
+        return 1 / average_frame_time if average_frame_time > 0 else 0.0
+
+    def wait(self) -> float:
+        current_time = time.perf_counter()
+        if self.__frame_start_time is None:
+            self.__frame_start_time = current_time
+            self.__deadline = current_time + self.__frame_budget
+            return 0.0
+
+        self.__work_time = current_time - self.__frame_start_time
+
+        if not self.uncapped:
+            if self.__deadline is None or current_time > self.__deadline:
+                self.__deadline = current_time
+            else:
+                remaining = self.__deadline - current_time
+                if remaining > self.__spin_threshold:
+                    sleep_time = remaining - self.__spin_threshold
+                    time.sleep(sleep_time)
+                    self.adapt_spin_threshold(time.perf_counter() - current_time - sleep_time)
+                while time.perf_counter() < self.__deadline:
+                    pass
+            self.__deadline += self.__frame_budget
+
+        end_time = time.perf_counter()
+        frame_time = end_time - self.__frame_start_time
+        self.__frame_times.append(frame_time)
+        self.__frame_start_time = end_time
+        return frame_time
+
+    def adapt_spin_threshold(self, overshoot: float):
+        decayed = self.__spin_threshold * FrameRateStabilizer.SPIN_THRESHOLD_DECAY
+        self.__spin_threshold = min(max(overshoot, decayed, FrameRateStabilizer.SPIN_THRESHOLD),
+                                    FrameRateStabilizer.MAX_SPIN_THRESHOLD)
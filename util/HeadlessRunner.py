@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import logging
+import os
+import time
+import typing
+
+import pygame
+
+from core.object_model.Stage import Stage
+from event.EventDispatcher import EventDispatcher
+from event.EventReplayer import EventReplayer
+from util.FrameProfiler import FrameProfiler
+
+
+class HeadlessRunner:
+    """
+    Drives a stage without a window or frame pacing, to measure simulation throughput.
+
+    Every tick runs one simulation step and renders the scene into the display surface, which is never presented.
+    Events are handed to `event_dispatcher` when there is one, and dropped otherwise.
+    With an `event_replayer`, input events come from the recording instead of the event queue, one step at a time.
+    """
+    DUMMY_DRIVER = "dummy"
+
+    @staticmethod
+    def use_dummy_drivers():
+        # Only effective before pygame initializes its video and audio subsystems
+        os.environ["SDL_VIDEODRIVER"] = HeadlessRunner.DUMMY_DRIVER
+        os.environ["SDL_AUDIODRIVER"] = HeadlessRunner.DUMMY_DRIVER
+
+    @staticmethod
+    def create_display_surface(size: typing.Tuple[int, int]) -> pygame.surface.Surface:
+        HeadlessRunner.use_dummy_drivers()
+        pygame.init()
+        # Surfaces are converted to the display format, so a display mode is needed even without a window
+        return pygame.display.set_mode(size)
+
+    def __init__(self, stage: Stage, event_dispatcher: typing.Optional[EventDispatcher] = None,
+                 event_replayer: typing.Optional[EventReplayer] = None):
+        self.__logger = logging.getLogger(self.__class__.__name__)
+        self.__stage = stage
+        self.__event_dispatcher = event_dispatcher
+        self.__event_replayer = event_replayer
+        self.__profiler = FrameProfiler()
+
+        self.__ticks = 0
+        self.__elapsed = 0.0
+
+    @property
+    def ticks(self) -> int:
+        return self.__ticks
+
+    @property
+    def elapsed(self) -> float:
+        return self.__elapsed
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.__ticks / self.__elapsed if self.__elapsed > 0 else 0.0
+
+    def tick(self):
+        self.__profiler.begin_frame()
+        events = pygame.event.get()
+        if self.__event_replayer is not None:
+            # Events the game posted itself still come from the queue; input comes from the recording
+            events = self.__event_replayer.replay(self.__ticks, events)
+
+        if self.__event_dispatcher is not None:
+            with self.__profiler.scope("frame.dispatch"):
+                self.__event_dispatcher.dispatch_all(events)
+
+        scene = self.__stage.scene
+        with self.__profiler.scope("frame.update"):
+            scene.snapshot()
+            scene.update()
+        with self.__profiler.scope("frame.render"):
+            scene.render(self.__stage.surface)
+        self.__ticks += 1
+
+    def run(self, frames: int, running: typing.Callable[[], bool] = lambda: True) -> float:
+        start_time = time.perf_counter()
+        start_ticks = self.__ticks
+        while self.__ticks - start_ticks < frames and running():
+            self.tick()
+
+        elapsed = time.perf_counter() - start_time
+        ticks = self.__ticks - start_ticks
+        self.__elapsed += elapsed
+
+        ticks_per_second = ticks / elapsed if elapsed > 0 else 0.0
+        self.__logger.info(f"{ticks} ticks in {elapsed:.3f}s, {ticks_per_second:.1f} ticks per second")
+        return ticks_per_second
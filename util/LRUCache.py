@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import collections
+import typing
+
+SizeOfCallable: typing.TypeAlias = typing.Callable[[typing.Any], int]
+EvictCallable: typing.TypeAlias = typing.Callable[[typing.Hashable, typing.Any], None]
+
+
+class LRUCache:
+    """
+    A least-recently-used cache bounded by a budget.
+
+    Every entry is weighted by `size_of` (1 per entry by default, so the budget is an entry count).
+    Inserting past the budget evicts the least recently used entries first; the entry being inserted is
+    always kept, even if it alone exceeds the budget. Owners may also `evict` entries they know are no longer needed.
+    """
+
+    def __init__(self, budget: int, size_of: typing.Optional[SizeOfCallable] = None,
+                 on_evict: typing.Optional[EvictCallable] = None):
+        self.__budget = budget
+        self.__size_of: SizeOfCallable = size_of if size_of is not None else lambda _: 1
+        self.__on_evict = on_evict
+        self.__entries: collections.OrderedDict[typing.Hashable, typing.Tuple[typing.Any, int]] = \
+            collections.OrderedDict()
+        self.__usage = 0
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    @property
+    def budget(self) -> int:
+        return self.__budget
+
+    @budget.setter
+    def budget(self, value: int):
+        self.__budget = value
+        self.trim()
+
+    @property
+    def usage(self) -> int:
+        return self.__usage
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    @property
+    def evictions(self) -> int:
+        return self.__evictions
+
+    def get(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.__misses += 1
+            return default
+
+        self.__hits += 1
+        self.__entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: typing.Hashable, value: typing.Any):
+        self.pop(key)
+        size = self.__size_of(value)
+        self.__entries[key] = (value, size)
+        self.__usage += size
+        self.trim(keep=key)
+
+    def pop(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+        entry = self.__entries.pop(key, None)
+        if entry is None:
+            return default
+
+        self.__usage -= entry[1]
+        return entry[0]
+
+    def trim(self, keep: typing.Optional[typing.Hashable] = None):
+        while self.__usage > self.__budget and len(self.__entries):
+            key = next(iter(self.__entries))
+            if key == keep:
+                if len(self.__entries) == 1:
+                    return
+                self.__entries.move_to_end(key)
+                continue
+
+            self.evict(key)
+
+    def evict(self, key: typing.Hashable):
+        entry = self.__entries.pop(key, None)
+        if entry is None:
+            return
+
+        (value, size) = entry
+        self.__usage -= size
+        self.__evictions += 1
+        if self.__on_evict is not None:
+            self.__on_evict(key, value)
+
+    def clear(self):
+        self.__entries.clear()
+        self.__usage = 0
+
+    def __contains__(self, key: typing.Hashable):
+        return key in self.__entries
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __iter__(self):
+        return iter(self.__entries)
+
+    def __repr__(self):
+        return f"LRUCache(entries={len(self.__entries)}, usage={self.__usage}, budget={self.__budget})"
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import typing
+
+import pygame
+
+from util import util
+from util.FrameProfiler import FrameProfiler
+
+
+class ProfilerOverlay:
+    """
+    Draws the frame times recorded by `FrameProfiler` as a graph, with the average time of each scope next to it.
+
+    The graph spans twice the frame budget of `target_fps`; the line across it marks the budget.
+    Frames over the budget are drawn in red.
+    """
+    SIZE = (480, 200)
+    GRAPH_HEIGHT = 80
+    AVERAGE_FRAME_COUNT = 60
+    FONT_SIZE = 14
+    BACKGROUND_COLOR = pygame.Color(0, 0, 0, 176)
+    TEXT_COLOR = pygame.Color("white")
+    FRAME_COLOR = pygame.Color("green")
+    SLOW_FRAME_COLOR = pygame.Color("red")
+    BUDGET_COLOR = pygame.Color("yellow")
+
+    def __init__(self, target_fps: int, position: typing.Tuple[int, int] = (0, 0), keep_profiling: bool = False):
+        self.__profiler = FrameProfiler()
+        self.__keep_profiling = keep_profiling
+        self.__frame_budget = 1 / target_fps
+        self.__position = position
+        self.__visible = False
+
+        self.__surface = pygame.surface.Surface(ProfilerOverlay.SIZE, pygame.SRCALPHA)
+        self.__font: typing.Optional[pygame.font.Font] = None
+
+    @property
+    def visible(self) -> bool:
+        return self.__visible
+
+    def toggle(self):
+        # Unless `keep_profiling` is set, the profiler only measures while the overlay is shown
+        self.__visible = not self.__visible
+        self.__profiler.enabled = self.__visible or self.__keep_profiling
+
+    def render(self, surface: pygame.surface.Surface):
+        if not self.__visible:
+            return
+
+        if self.__font is None:
+            self.__font = util.text_render_get_font_object("default", ProfilerOverlay.FONT_SIZE, False, False)
+
+        self.__surface.fill(ProfilerOverlay.BACKGROUND_COLOR)
+        self.render_graph()
+        self.render_breakdown()
+        surface.blit(self.__surface, self.__position)
+
+    def render_graph(self):
+        (width, _) = ProfilerOverlay.SIZE
+        graph_height = ProfilerOverlay.GRAPH_HEIGHT
+        frames = list(self.__profiler.history)[-width:]
+        scale = graph_height / (2 * self.__frame_budget)
+
+        for (x, frame) in enumerate(frames, width - len(frames)):
+            bar_height = min(round(frame.frame_time * scale), graph_height)
+            color = ProfilerOverlay.SLOW_FRAME_COLOR if frame.frame_time > self.__frame_budget \
+                else ProfilerOverlay.FRAME_COLOR
+            pygame.draw.line(self.__surface, color, (x, graph_height), (x, graph_height - bar_height))
+
+        budget_y = graph_height - round(self.__frame_budget * scale)
+        pygame.draw.line(self.__surface, ProfilerOverlay.BUDGET_COLOR, (0, budget_y), (width, budget_y))
+
+    def render_breakdown(self):
+        frames = list(self.__profiler.history)[-ProfilerOverlay.AVERAGE_FRAME_COUNT:]
+        frame_time = sum(frame.frame_time for frame in frames) / len(frames) if len(frames) else 0.0
+        lines = [f"frame {frame_time * 1000:6.2f} ms"]
+        lines.extend(f"{name} {elapsed * 1000:6.2f} ms" for (name, elapsed)
+                     in self.__profiler.average_scope_times(ProfilerOverlay.AVERAGE_FRAME_COUNT).items())
+
+        line_height = self.__font.get_linesize()
+        column_width = ProfilerOverlay.SIZE[0] // 2
+        rows = (ProfilerOverlay.SIZE[1] - ProfilerOverlay.GRAPH_HEIGHT) // line_height
+        for (i, line) in enumerate(lines[:2 * rows]):
+            text = self.__font.render(line, True, ProfilerOverlay.TEXT_COLOR)
+            self.__surface.blit(text, ((i // rows) * column_width + 4,
+                                       ProfilerOverlay.GRAPH_HEIGHT + (i % rows) * line_height))